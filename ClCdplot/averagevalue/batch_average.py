@@ -0,0 +1,51 @@
+import os
+import sys
+import glob
+import argparse
+
+# forceCoeffs reader and averaging engine live in ../plot
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plot"))
+from averaging import average_files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time-averaged force coefficients for every .dat file of a sweep."
+    )
+    parser.add_argument("data_folder", nargs="?", default="./data_averageCl",
+                        help="Folder with the forceCoeffs .dat files (default: ./data_averageCl)")
+    parser.add_argument("--window", nargs=2, type=float, action="append", metavar=("TMIN", "TMAX"),
+                        help="Averaging window; repeat for several windows (default: 0.47 0.96)")
+    parser.add_argument("--quantities", nargs="+", default=["Cl", "Cd"],
+                        help="Columns to average (default: Cl Cd)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write cached results")
+    parser.add_argument("--output", default="output_info.csv",
+                        help="Result table; .json writes records, anything else CSV")
+    args = parser.parse_args()
+
+    data_files = sorted(glob.glob(os.path.join(args.data_folder, "*.dat")))
+    if not data_files:
+        print(f"No .dat files found in {args.data_folder}.")
+        sys.exit(1)
+
+    table = average_files(
+        data_files,
+        args.window or [(0.47, 0.96)],
+        args.quantities,
+        processes=args.processes,
+        cache_dir="" if args.no_cache else None,
+    )
+
+    if args.output.endswith(".json"):
+        table.to_json(args.output, orient="records", indent=2)
+    else:
+        table.to_csv(args.output, index=False)
+
+    print(table.to_string(index=False))
+    print(f"The information has been saved to {args.output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
+import os
+import sys
 import plclcd
-import pandas as pd
 import matplotlib.pyplot as plt
 
+# forceCoeffs reader and averaging engine live in ../plot
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "plot"))
+from averaging import average_file
+from forcecoeffs_reader import read_force_coeffs
+
 # Enable LaTeX rendering for text
 plt.rcParams.update({
     "text.usetex": True,
@@ -9,37 +15,12 @@ plt.rcParams.update({
     "font.serif": ["Computer Modern"],  # Use LaTeX's default font
 })
 
-# Load data from file
-data = pd.read_csv('coefficient.dat', delim_whitespace=True)
-
-# Filter the DataFrame based on a condition for the "Time" column
+# Time window and quantities to average
 time_min, time_max = 1.58, 2.33  # Specify the range for "Time"
-filtered_data = data[(data['Time'] >= time_min) & (data['Time'] <= time_max)]
-
-# Quantities to process
 quantities = ['Cl', 'Cd']  # Add more column names here as needed
 
-# Initialize a dictionary to store results
-results = {}
-
-# Process each quantity dynamically
-for quantity in quantities:
-    # Extract time and quantity values
-    time_points = filtered_data['Time'].values
-    quantity_values = filtered_data[quantity].values
-    
-    # Calculate time intervals (assuming non-uniform spacing)
-    time_intervals = time_points[1:] - time_points[:-1]
-    
-    # Calculate the average as a weighted sum if time intervals are non-uniform
-    # Slicing starts from the beginning of quantity_values and excludes the end index, the last element is omitted.
-    # Note that you cannot factor 2*time_intervals outside the summation function because the time_intervals vary
-    # across segments
-    average = sum((quantity_values[:-1] + quantity_values[1:]) / 2 * time_intervals) / (time_points[-1] - time_points[0])
-    
-    # Store results
-    count = len(quantity_values)
-    results[quantity] = {'average': average, 'count': count}
+# Trapezoidal time-weighted statistics, streamed from the file in blocks
+results = average_file('coefficient.dat', [(time_min, time_max)], quantities)[(time_min, time_max)]
 
 # Write results to an output file
 output_file = "output_info.txt"
@@ -47,6 +28,9 @@ with open(output_file, "w") as f:
     for quantity, result in results.items():
         f.write(f"{quantity}:\n")
         f.write(f"  Average: {result['average']}\n")
+        f.write(f"  RMS: {result['rms']}\n")
+        f.write(f"  Min: {result['min']}\n")
+        f.write(f"  Max: {result['max']}\n")
         f.write(f"  Count: {result['count']}\n")
 
 # Print results to console for verification
@@ -56,6 +40,9 @@ for quantity, stats in results.items():
 
 print(f"The information has been saved to {output_file}.")
 
+# Load only the columns needed for plotting
+data = read_force_coeffs('coefficient.dat', columns=("Time", "Cl", "Cd"))
+
 # Configuration: filename and figure size
 filename = "Cd"
 figsize = (16, 9)
@@ -1,7 +1,8 @@
 def plot_coefficients(data, filename, figtitle, figsize, xrange, yrange, linecolor, grid, indicator_lines=None, 
-                      ytick_remove=-0.01, text_yoffset=0.1, text_xoffset = 0.1, show_indicators=True):
+                      ytick_remove=-0.01, text_yoffset=0.1, text_xoffset = 0.1, show_indicators=True,
+                      quantity=None, show=True):
     """
-    Function to plot Cl or Cd based on user input.
+    Function to plot Cl or Cd.
     Args:
         filename (str): The filename to save the plot as.
         figsize (tuple): The figure size for the plot.
@@ -14,17 +15,18 @@ def plot_coefficients(data, filename, figtitle, figsize, xrange, yrange, linecol
         ytick_remove(float): In case x and y ticks overlap at the corner of the graph.
         text_offset (float): The vertical offset for indicator labels relative to yrange[1].
         show_indicators (bool): A flag to enable or disable drawing the indicators.
+        quantity (str): "Cd" or "Cl"; defaults to the base name of filename.
+        show (bool): Show the plot window; False only saves the file (batch runs).
     """
+    import os
     import matplotlib.pyplot as plt
 
-    # User input for the case
-    input_string = input("Enter your case (Cd or Cl): ")
+    quantity = quantity or os.path.basename(filename)
 
     # Create the plot with the specified figure size
     plt.figure(figsize=figsize)
 
-    # Match-case to handle user input
-    match input_string:
+    match quantity:
         case "Cd":
             print("*** You are plotting Cd. ***")
             plt.plot(data["Time"], data["Cd"], label=r'$C_d$', color=linecolor, linewidth=2)
@@ -34,8 +36,8 @@ def plot_coefficients(data, filename, figtitle, figsize, xrange, yrange, linecol
             plt.plot(data["Time"], data["Cl"], label=r'$C_l$', color=linecolor, linewidth=2)
             caption = "Lift coefficient"
         case _:
-            print("Unknown case. Please enter a valid case.")
-            return  # Exit the function if the input is invalid
+            print(f"Unknown case '{quantity}'. Use Cd or Cl.")
+            return  # Exit the function if the case is invalid
 
     # Set labels, title, and limits with LaTeX formatting
     plt.xlabel(r'Time (Seconds)', fontsize=22)
@@ -77,4 +79,5 @@ def plot_coefficients(data, filename, figtitle, figsize, xrange, yrange, linecol
     plt.savefig(f"{filename}.pdf", bbox_inches='tight', format='pdf')
 
     # Show the plot
-    plt.show()
\ No newline at end of file
+    if show:
+        plt.show()
\ No newline at end of file
@@ -0,0 +1,180 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from forcecoeffs_reader import iter_force_coeffs, read_header
+from cache import cache_dir as _cache_root, file_digest  # waves/pack, put on the path by forcecoeffs_reader
+
+
+# Per-file results of average_files, keyed by file content, windows and quantities,
+# kept under the shared cache location; results written by an older format version
+# are not reused
+result_cache_dir = os.path.join(_cache_root, "averages")
+_result_version = 2
+
+
+class WindowStats:
+    """
+    Running time-weighted statistics of several quantities over one time window.
+
+    Samples are fed in file order through update(), one block at a time; only samples
+    with time_min <= Time <= time_max are used. Consecutive selected samples are joined
+    by trapezoids, also across block boundaries, so the result does not depend on the
+    block size and memory use does not depend on the file length.
+    """
+
+    def __init__(self, n_quantities, time_min=-np.inf, time_max=np.inf):
+        self.time_min = time_min
+        self.time_max = time_max
+        self.count = 0
+        self.first_time = None
+        self.last_time = None
+        self.last_values = None
+        self.integral = np.zeros(n_quantities)
+        self.integral_sq = np.zeros(n_quantities)
+        self.minimum = np.full(n_quantities, np.inf)
+        self.maximum = np.full(n_quantities, -np.inf)
+
+    def update(self, time, values):
+        """Add a block of samples: time has shape (n,), values has shape (n, n_quantities)."""
+        mask = (time >= self.time_min) & (time <= self.time_max)
+        if not mask.all():
+            time, values = time[mask], values[mask]
+        if not time.size:
+            return
+
+        if self.last_time is None:
+            self.first_time = time[0]
+        else:
+            # Trapezoid joining the previous block to this one
+            dt = time[0] - self.last_time
+            self.integral += (self.last_values + values[0]) / 2 * dt
+            self.integral_sq += (self.last_values**2 + values[0]**2) / 2 * dt
+
+        dt = np.diff(time)[:, None]
+        squares = values**2
+        self.integral += ((values[:-1] + values[1:]) / 2 * dt).sum(axis=0)
+        self.integral_sq += ((squares[:-1] + squares[1:]) / 2 * dt).sum(axis=0)
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+        self.count += len(time)
+        self.last_time = time[-1]
+        self.last_values = values[-1].copy()
+
+    @property
+    def duration(self):
+        return 0.0 if self.count == 0 else self.last_time - self.first_time
+
+    def result(self, quantities):
+        """Return {quantity: {'average', 'rms', 'min', 'max', 'count'}}; NaN for an empty window."""
+        duration = self.duration
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average = self.integral / duration
+            rms = np.sqrt(self.integral_sq / duration)
+        minimum, maximum = self.minimum, self.maximum
+        if self.count == 0:
+            minimum = maximum = np.full(len(self.minimum), np.nan)
+        return {
+            quantity: {
+                "average": float(average[k]),
+                "rms": float(rms[k]),
+                "min": float(minimum[k]),
+                "max": float(maximum[k]),
+                "count": int(self.count),
+            }
+            for k, quantity in enumerate(quantities)
+        }
+
+
+def average_file(path, windows, quantities=("Cl", "Cd"), chunksize=1_000_000):
+    """
+    Time-weighted statistics of a forceCoeffs .dat file in a single streaming pass.
+
+    Parameters:
+        path (str): Path to the .dat file.
+        windows (list): (time_min, time_max) pairs; any number of windows, possibly overlapping.
+        quantities (tuple): Columns to average; columns missing from the file are skipped.
+        chunksize (int): Rows read per block, which bounds the memory use.
+
+    Returns:
+        dict: {(time_min, time_max): {quantity: {'average', 'rms', 'min', 'max', 'count'}}}
+    """
+    names, _ = read_header(path)
+    quantities = [quantity for quantity in quantities if quantity in names]
+    stats = [WindowStats(len(quantities), time_min, time_max) for time_min, time_max in windows]
+
+    for chunk in iter_force_coeffs(path, ["Time"] + quantities, chunksize=chunksize):
+        time = chunk["Time"].to_numpy()
+        values = chunk[quantities].to_numpy()
+        for window_stats in stats:
+            window_stats.update(time, values)
+
+    return {tuple(window): s.result(quantities) for window, s in zip(windows, stats)}
+
+
+def _average_cached(path, windows, quantities, cache_dir):
+    key = hashlib.sha1(
+        json.dumps([_result_version, file_digest(path), windows, quantities]).encode()
+    ).hexdigest()
+    cache_file = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    if cache_file and os.path.exists(cache_file):
+        with open(cache_file) as f:
+            return json.load(f)
+
+    # JSON keys must be strings, so windows are stored as a list in input order
+    stats = average_file(path, windows, quantities)
+    result = [stats[tuple(window)] for window in windows]
+    if cache_file:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{cache_file}.tmp{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, cache_file)
+    return result
+
+
+def average_files(paths, windows, quantities=("Cl", "Cd"), processes=None, cache_dir=None):
+    """
+    Average many forceCoeffs .dat files in a process pool, reusing cached per-file results.
+
+    Each file's result is cached under a hash of its content, the windows and the
+    quantities, so unchanged files are not parsed again on later runs.
+
+    Parameters:
+        paths (list): .dat files to process.
+        windows (list): (time_min, time_max) pairs applied to every file.
+        quantities (tuple): Columns to average.
+        processes (int, optional): Worker processes; None uses all cores, 1 runs serially.
+        cache_dir (str, optional): Result cache directory (default result_cache_dir);
+            pass "" to disable caching.
+
+    Returns:
+        DataFrame: One row per file, window and quantity with columns file, time_min,
+        time_max, quantity, average, rms, min, max and count.
+    """
+    windows = [[float(time_min), float(time_max)] for time_min, time_max in windows]
+    quantities = list(quantities)
+    cache_dir = result_cache_dir if cache_dir is None else cache_dir
+    args = [(path, windows, quantities, cache_dir) for path in paths]
+
+    if processes == 1 or len(paths) < 2:
+        per_file = [_average_cached(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            per_file = list(pool.map(_average_cached, *zip(*args)))
+
+    rows = []
+    for path, file_results in zip(paths, per_file):
+        for (time_min, time_max), stats in zip(windows, file_results):
+            for quantity, result in stats.items():
+                rows.append({
+                    "file": os.path.basename(path),
+                    "time_min": time_min,
+                    "time_max": time_max,
+                    "quantity": quantity,
+                    **result,
+                })
+    columns = ["file", "time_min", "time_max", "quantity", "average", "rms", "min", "max", "count"]
+    return pd.DataFrame(rows, columns=columns)
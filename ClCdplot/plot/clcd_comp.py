@@ -4,6 +4,13 @@ import matplotlib.pyplot as plt
 import glob
 import logging
 import os
+import sys
+
+# Alignment helpers live in waves/pack
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "waves", "pack"))
+from forcecoeffs_reader import read_force_coeffs, read_force_coeffs_restarts
+from error_metrics import reference_series, score_runs
+from alignment import estimate_time_shift
 
 # Enable LaTeX rendering for text
 plt.rcParams.update({
@@ -34,6 +41,16 @@ match filename:
 
 grid = True
 
+# Estimate the time shift of the experiment (and T_gust among align_scales, e.g.
+# [0.45, 0.5, 0.55]; None keeps T_gust) by cross-correlation with the run align_to,
+# instead of using the values set where the experimental data is loaded (Cl only)
+auto_align = False
+align_to = "omega15"
+align_scales = None
+
+# Table of error metrics of every run against the experiment (Cl only); None to skip
+metrics_file = "results/metrics_Cl.csv"
+
 # Specify manual overrides for specific filenames (base filenames without paths)
 manual_overrides = {
     "": {"style": "-", "color": "red", "alpha": 0.1},
@@ -42,6 +59,12 @@ manual_overrides = {
     "coefficient": {"style": "-", "color": "red", "alpha": 1},
 }
 
+# Restarted runs plotted as one curve: label -> base filenames of the restart files.
+# Where their time ranges overlap the later restart is used.
+restart_cases = {
+    # "omega404": ["omega404", "omega404_continue"],
+}
+
 # Specify filenames to skip (base filenames without paths)
 skip_files = {"omega404", "omega304", "coefficient","coefficient_0.14","omega15","omega50","Solver_v1", "omega100"}
 conflicting_files = set(manual_overrides.keys()).intersection(skip_files)
@@ -70,6 +93,7 @@ try:
     logging.info(f"Experimental data loaded from {exp_data_file}")
 
     # Apply a horizontal shift to the "Time" column
+    exp_time = exp_data["Time"].to_numpy()
     T_gust = 0.5
     time_shift = 0.12  # Modify this value as needed
     exp_data["Time"] = exp_data["Time"] * T_gust + time_shift
@@ -95,14 +119,24 @@ line_alphas = []
 data_list = []
 labels = []
 
-for i, dat_file in enumerate(dat_files):
+# One curve per file, except that the files of a restarted run form one curve
+case_of = {base: case for case, bases in restart_cases.items() for base in bases}
+curves = {}
+for dat_file in dat_files:
     file_base = os.path.splitext(os.path.basename(dat_file))[0]
+    curves.setdefault(case_of.get(file_base, file_base), []).append(dat_file)
+
+for i, (file_base, paths) in enumerate(curves.items()):
     if file_base in skip_files:
-        print(f"Skipping file: {dat_file}")
-        logging.info(f"Skipping file: {dat_file}")
+        print(f"Skipping file: {', '.join(paths)}")
+        logging.info(f"Skipping file: {', '.join(paths)}")
         continue
 
-    data = pd.read_csv(dat_file, sep=r'\s+')
+    if len(paths) > 1:
+        logging.info(f"Merging restarts of {file_base}: {paths}")
+        data = read_force_coeffs_restarts(paths, columns=("Time", filename), use_cache=True)
+    else:
+        data = read_force_coeffs(paths[0], columns=("Time", filename), use_cache=True)
     data_list.append(data)
     labels.append(file_base)
 
@@ -116,6 +150,39 @@ for i, dat_file in enumerate(dat_files):
         line_colors.append(default_colors[i % len(default_colors)])
         line_alphas.append(default_alphas[i % len(default_alphas)])
 
+# Line the experiment up with one run
+if auto_align and exp_data is not None and filename == "Cl" and align_to in labels:
+    run = data_list[labels.index(align_to)]
+    reference_time, reference_values = reference_series(exp_time, exp_data["Cl"])
+    shifts, scales, correlation = estimate_time_shift(
+        [run["Time"].to_numpy()], [run[filename].to_numpy()], reference_time, reference_values,
+        scales=align_scales or [T_gust],
+    )
+    if not pd.isna(correlation[0]):  # Some overlap of experiment and run was found
+        T_gust, time_shift = scales[0], shifts[0]
+        exp_data["Time"] = exp_time * T_gust + time_shift
+        print(f"Aligned to {align_to}: T_gust = {T_gust:g}, time_shift = {time_shift:.6g} "
+              f"(correlation {correlation[0]:.3f})")
+        logging.info(f"Experimental data aligned to {align_to}: T_gust = {T_gust}, time_shift = {time_shift}")
+    else:
+        logging.warning(f"No alignment with {align_to} found; keeping time_shift = {time_shift}")
+
+# Score all runs against the experiment on a common time grid
+if metrics_file and exp_data is not None and filename == "Cl" and data_list:
+    reference_time, reference_values = reference_series(exp_data["Time"], exp_data["Cl"])
+    try:
+        metrics = score_runs(
+            [data["Time"].to_numpy() for data in data_list],
+            [data[filename].to_numpy() for data in data_list],
+            reference_time, reference_values, labels,
+        )
+    except ValueError as e:  # No run overlaps the experiment; plot anyway
+        logging.warning(f"No error metrics against the experiment: {e}")
+    else:
+        metrics.to_csv(metrics_file, index=False)
+        print(metrics.to_string(index=False))
+        logging.info(f"Error metrics against the experiment saved to {metrics_file}")
+
 # Determine xrange based on data
 if data_list:
     max_time = max(data["Time"].max() for data in data_list)
@@ -161,4 +228,5 @@ plclcd_comp.plot_coefficients_comparison(
     exp_marker=exp_marker,
     plot_lines=plot_lines,
     plot_markers=plot_markers,
+    decimate=True,
 )
\ No newline at end of file
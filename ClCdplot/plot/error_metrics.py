@@ -0,0 +1,173 @@
+import os
+import sys
+import glob
+import argparse
+import numpy as np
+import pandas as pd
+
+# Resampling lives in waves/pack
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "waves", "pack"))
+from resampling import resample
+from forcecoeffs_reader import read_force_coeffs
+
+metric_columns = ["rmse", "max_abs_error", "l2", "peak_error", "peak_time_error", "correlation", "coverage"]
+
+
+def error_metrics(grid, runs, reference):
+    """
+    Error metrics of many runs against one reference on a uniform grid, all at once.
+
+    Samples where a run is NaN (outside its time range) are left out of that run's
+    metrics.
+
+    Parameters:
+        grid (ndarray): (n_samples,) uniform grid times.
+        runs (ndarray): (n_runs, n_samples) run values on the grid.
+        reference (ndarray): (n_samples,) reference values on the grid.
+
+    Returns:
+        dict: {metric: (n_runs,) array} for the names in metric_columns. The L2 norm is
+        that of the difference over time, sqrt(integral of error^2 dt); peak errors are
+        run minus reference for the maximum and its time.
+    """
+    runs = np.atleast_2d(runs)
+    valid = ~np.isnan(runs)
+    count = valid.sum(axis=1)
+    dt = grid[1] - grid[0] if len(grid) > 1 else 0.0
+
+    error = np.where(valid, runs - reference, 0.0)
+    square_sum = np.einsum("ij,ij->i", error, error)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rmse = np.sqrt(square_sum / count)
+        # Pearson correlation over the samples of each run
+        run_centered = np.where(
+            valid, runs - np.where(valid, runs, 0.0).sum(axis=1, keepdims=True) / count[:, None], 0.0
+        )
+        reference_centered = np.where(
+            valid, reference - np.where(valid, reference, 0.0).sum(axis=1, keepdims=True) / count[:, None], 0.0
+        )
+        correlation = np.einsum("ij,ij->i", run_centered, reference_centered) / np.sqrt(
+            np.einsum("ij,ij->i", run_centered, run_centered)
+            * np.einsum("ij,ij->i", reference_centered, reference_centered)
+        )
+
+    # Peaks; runs without any sample get NaN
+    filled_runs = np.where(valid, runs, -np.inf)
+    filled_reference = np.where(valid, reference, -np.inf)
+    run_peak = filled_runs.argmax(axis=1)
+    reference_peak = filled_reference.argmax(axis=1)
+    rows = np.arange(len(runs))
+    empty = count == 0
+    with np.errstate(invalid="ignore"):
+        peak_error = filled_runs[rows, run_peak] - filled_reference[rows, reference_peak]
+
+    metrics = {
+        "rmse": rmse,
+        "max_abs_error": np.abs(error).max(axis=1, initial=0.0),
+        "l2": np.sqrt(square_sum * dt),
+        "peak_error": peak_error,
+        "peak_time_error": grid[run_peak] - grid[reference_peak],
+        "correlation": correlation,
+        "coverage": count / runs.shape[1],
+    }
+    for name in metric_columns[:-1]:
+        metrics[name] = np.where(empty, np.nan, metrics[name])
+    return metrics
+
+
+def score_runs(times_list, values_list, reference_time, reference_values, labels=None,
+               n_samples=1000, method="linear"):
+    """
+    Score many runs against a reference series, e.g. simulated against experimental Cl.
+
+    Runs and reference are resampled onto one uniform grid over the part of the
+    reference time range covered by any run (see resampling.resample), and all runs
+    are scored in one batched computation. The coverage column gives the fraction of
+    the grid a run covers.
+
+    Parameters:
+        times_list (list): Time array of each run.
+        values_list (list): Matching value arrays.
+        reference_time (array): Reference times, strictly increasing.
+        reference_values (array): Reference values.
+        labels (list, optional): Run names; default run0, run1, ...
+        n_samples (int): Number of grid points.
+        method (str): Resampling of the runs: "linear", "cubic" or "bin".
+
+    Returns:
+        DataFrame: One row per run with the columns of metric_columns, sorted by RMSE.
+    """
+    reference_time = np.asarray(reference_time, dtype=float)
+    start = max(reference_time[0], min(np.min(t) for t in times_list))
+    end = min(reference_time[-1], max(np.max(t) for t in times_list))
+    if end <= start:
+        raise ValueError("No run overlaps the time range of the reference")
+    grid = np.linspace(start, end, n_samples)
+    reference = resample([reference_time], [reference_values], grid)[0]
+    runs = resample(times_list, values_list, grid, method=method)
+
+    table = pd.DataFrame(error_metrics(grid, runs, reference), columns=metric_columns)
+    table.insert(0, "run", labels if labels is not None else [f"run{k}" for k in range(len(runs))])
+    return table.sort_values("rmse", kind="stable", ignore_index=True)
+
+
+def read_reference(path, time_scale=1.0, time_shift=0.0):
+    """Experimental (Time, Cl) table with time * time_scale + time_shift, as in clcd_comp.py."""
+    data = pd.read_csv(path)
+    data.columns = ["Time", "Cl"] + list(data.columns[2:])
+    time, values = reference_series(data["Time"], data["Cl"])
+    return time * time_scale + time_shift, values
+
+
+def reference_series(time, values):
+    """Reference sorted by time, keeping the first of repeated times (digitized data)."""
+    time = np.asarray(time, dtype=float)
+    order = np.argsort(time, kind="stable")
+    time, values = time[order], np.asarray(values, dtype=float)[order]
+    keep = np.concatenate([[True], np.diff(time) > 0])
+    return time[keep], values[keep]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score forceCoeffs runs against experimental data.")
+    parser.add_argument("data_folder", nargs="?", default="./data",
+                        help="Folder with the forceCoeffs .dat files (default: ./data)")
+    parser.add_argument("--reference", default="./exp_data/exp_data.csv",
+                        help="Experimental data, columns Time and Cl (default: ./exp_data/exp_data.csv)")
+    parser.add_argument("--quantity", default="Cl", help="Column of the runs to score (default: Cl)")
+    parser.add_argument("--time-scale", type=float, default=0.5,
+                        help="Factor on the reference time, T_gust in clcd_comp.py (default: 0.5)")
+    parser.add_argument("--time-shift", type=float, default=0.12,
+                        help="Shift added to the scaled reference time (default: 0.12)")
+    parser.add_argument("--samples", type=int, default=1000, help="Grid points (default: 1000)")
+    parser.add_argument("--method", default="linear", choices=["linear", "cubic", "bin"],
+                        help="Resampling of the runs (default: linear)")
+    parser.add_argument("--sort", default="rmse", help="Column to sort the table by (default: rmse)")
+    parser.add_argument("--output", default="metrics.csv", help="Result table (default: metrics.csv)")
+    args = parser.parse_args()
+
+    dat_files = sorted(glob.glob(os.path.join(args.data_folder, "*.dat")))
+    if not dat_files:
+        print(f"No .dat files found in {args.data_folder}.")
+        sys.exit(1)
+
+    times_list, values_list = [], []
+    for path in dat_files:
+        data = read_force_coeffs(path, columns=("Time", args.quantity), use_cache=True)
+        times_list.append(data["Time"].to_numpy())
+        values_list.append(data[args.quantity].to_numpy())
+    labels = [os.path.splitext(os.path.basename(path))[0] for path in dat_files]
+
+    reference_time, reference_values = read_reference(args.reference, args.time_scale, args.time_shift)
+    table = score_runs(times_list, values_list, reference_time, reference_values, labels,
+                       args.samples, args.method)
+    table = table.sort_values(args.sort, ascending=args.sort != "correlation", kind="stable", ignore_index=True)
+    table.to_csv(args.output, index=False)
+
+    print(table.to_string(index=False))
+    print(f"Metrics saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
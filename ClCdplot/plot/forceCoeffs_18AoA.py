@@ -1,8 +1,9 @@
 import os
 import glob
-import plclcd
-import pandas as pd
 import matplotlib.pyplot as plt
+from forcecoeffs_reader import read_force_coeffs
+import plclcd
+from averaging import average_files
 
 # Enable LaTeX rendering for text
 plt.rcParams.update({
@@ -30,32 +31,11 @@ quantities = ['Cl', 'Cd']  # Add more column names as needed
 # Initialize a dictionary to store results
 results = {}
 
-# Process each data file
-for file_path in data_files:
-    file_name = os.path.basename(file_path)  # Extract the file name for reference
-    
-    # Load data from the file
-    data = pd.read_csv(file_path, delim_whitespace=True)
-
-    # Filter the DataFrame based on the time range
-    filtered_data = data[(data['Time'] >= time_min) & (data['Time'] <= time_max)]
-
-    # Process each quantity dynamically
-    for quantity in quantities:
-        if quantity in filtered_data.columns:
-            # Extract time and quantity values
-            time_points = filtered_data['Time'].values
-            quantity_values = filtered_data[quantity].values
-            
-            # Calculate time intervals (assuming non-uniform spacing)
-            time_intervals = time_points[1:] - time_points[:-1]
-
-            # Calculate weighted average
-            average = sum((quantity_values[:-1] + quantity_values[1:]) / 2 * time_intervals) / (time_points[-1] - time_points[0])
-            
-            # Store results
-            count = len(quantity_values)
-            results[(file_name, quantity)] = {'average': average, 'count': count}
+# Process each data file in a single streaming pass; unchanged files reuse cached
+# results (see batch_average.py for the parallel, table-writing version)
+table = average_files(data_files, [(time_min, time_max)], quantities, processes=1)
+for row in table.itertuples():
+    results[(row.file, row.quantity)] = {'average': row.average, 'count': row.count}
 
 # Write results to an output file
 output_file = "output_info.txt"
@@ -72,6 +52,9 @@ for (file_name, quantity), stats in results.items():
 
 print(f"The information has been saved to {output_file}.")
 
+# Load only the columns needed for plotting the last file
+data = read_force_coeffs(data_files[-1], columns=("Time", "Cl", "Cd"))
+
 # Plotting Configuration
 filename = "Cl"
 figsize = (16, 9)
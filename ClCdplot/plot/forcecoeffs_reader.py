@@ -0,0 +1,118 @@
+import os
+import sys
+import pandas as pd
+
+# The sidecar cache, restart splicing and bulk row parser are shared with the probe
+# readers in waves/pack
+_pack_dir = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "waves", "pack"))
+if _pack_dir not in sys.path:
+    sys.path.insert(0, _pack_dir)
+from cache import cached_load
+from restarts import splice_restarts
+from file_processing import parse_block, parse_lines
+
+
+def read_header(path):
+    """
+    Read the column header of a forceCoeffs .dat file.
+
+    Accepts both the plain 'Time Cd Cd(f) ...' header and the '# Time Cd ...' form
+    preceded by '#' comment lines.
+
+    Returns:
+        columns (list): Column names in file order.
+        n_header (int): Number of lines up to and including the header.
+    """
+    with open(path, "r") as f:
+        for n_header, line in enumerate(f, start=1):
+            tokens = line.lstrip("#").split()
+            if tokens and tokens[0] == "Time":
+                return tokens, n_header
+            if not line.startswith("#"):
+                break
+    raise ValueError(f"No 'Time' header found in {path}")
+
+
+def parse_rows(text, n_columns):
+    """
+    Parse complete lines of forceCoeffs data into an (n_rows, n_columns) array.
+
+    Comment, header and malformed lines are skipped; the common case of clean rows
+    is converted in one pass by file_processing.parse_block.
+    """
+    n_rows = text.count("\n") + (not text.endswith("\n"))
+    rows = parse_block(text, n_rows, n_columns)
+    if rows is not None:
+        return rows
+    return parse_lines(text.splitlines(), n_columns)
+
+
+def _csv_options(path, columns, dtype):
+    names, n_header = read_header(path)
+    missing = [name for name in columns if name not in names]
+    if missing:
+        raise KeyError(f"Columns {missing} not found in {path}; available: {names}")
+
+    # Header handled above, so the C parser only converts the selected columns
+    options = dict(
+        sep=r"\s+",
+        header=None,
+        skiprows=n_header,
+        comment="#",
+        usecols=[names.index(name) for name in columns],
+        dtype=dtype,
+    )
+    return names, options
+
+
+def _parse_force_coeffs(path, columns, dtype):
+    names, options = _csv_options(path, columns, dtype)
+    data = pd.read_csv(path, **options)
+    data.columns = [names[i] for i in data.columns]
+    return data[list(columns)]
+
+
+def iter_force_coeffs(path, columns=("Time", "Cl"), chunksize=1_000_000, dtype="float64"):
+    """Yield the selected columns of a forceCoeffs .dat file in blocks of chunksize rows."""
+    columns = tuple(columns)
+    names, options = _csv_options(path, columns, dtype)
+    with pd.read_csv(path, chunksize=chunksize, **options) as reader:
+        for chunk in reader:
+            chunk.columns = [names[i] for i in chunk.columns]
+            yield chunk[list(columns)]
+
+
+def read_force_coeffs(path, columns=("Time", "Cl"), dtype="float64", use_cache=False):
+    """
+    Load selected columns of a forceCoeffs .dat file.
+
+    Parameters:
+        path (str): Path to the .dat file.
+        columns (tuple): Columns to parse; all others are skipped (default Time and Cl).
+        dtype (str): "float64" or "float32".
+        use_cache (bool): Memory-map a binary copy of the parsed columns, written on the
+            first load (see cache.cached_load in waves/pack).
+
+    Returns:
+        DataFrame: The requested columns in the requested order.
+    """
+    columns = tuple(columns)
+    if use_cache:
+        return cached_load(path, _parse_force_coeffs, columns=columns, dtype=dtype)
+    return _parse_force_coeffs(path, columns, dtype)
+
+
+def read_force_coeffs_restarts(paths, columns=("Time", "Cl"), dtype="float64", use_cache=False):
+    """
+    Load the forceCoeffs files of a restarted run as one contiguous series.
+
+    Files are ordered by their first time and in overlapping time ranges the later
+    restart wins (see restarts.splice_restarts in waves/pack).
+    Takes the same options as read_force_coeffs; columns must include "Time".
+    """
+    columns = list(columns)
+    parts = [read_force_coeffs(path, columns, dtype, use_cache) for path in paths]
+    _, values = splice_restarts(
+        [part["Time"].to_numpy() for part in parts], [part.to_numpy() for part in parts]
+    )
+    return pd.DataFrame(values, columns=columns)
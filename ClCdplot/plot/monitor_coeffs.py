@@ -0,0 +1,194 @@
+import os
+import time
+import argparse
+import numpy as np
+import matplotlib.pyplot as plt
+from forcecoeffs_reader import parse_rows
+from averaging import WindowStats
+
+# Leading bytes of the file (header and first rows) compared on every poll to detect a
+# rewrite that is already longer than what was read
+head_size = 4096
+
+
+class CoeffsFollower:
+    """
+    Incrementally read a forceCoeffs .dat file that is still being written.
+
+    Each poll() reads only the bytes appended since the previous call and returns the
+    complete new rows; a trailing partial line is kept until its newline arrives. If the
+    file was rewritten (solver restarted and overwrote it: it shrank, it is a new inode
+    or its leading bytes changed) reading starts again from the top and poll() reports
+    the restart, so statistics of the old run can be dropped.
+    """
+
+    def __init__(self, path, quantities=("Cl", "Cd")):
+        self.path = path
+        self.quantities = list(quantities)
+        self.offset = 0
+        self.partial = b""
+        self.columns = None
+        self.indices = None
+        self.restarted = False
+        self.inode = None
+        self.head = b""
+
+    def _read_new_bytes(self):
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return b""  # Not written yet
+        with f:
+            stat = os.fstat(f.fileno())
+            if self.offset and (stat.st_ino != self.inode or stat.st_size < self.offset
+                                or f.read(len(self.head)) != self.head):
+                self.offset, self.partial, self.columns, self.head = 0, b"", None, b""
+                self.restarted = True
+            self.inode = stat.st_ino
+            if stat.st_size == self.offset:
+                return b""
+            f.seek(self.offset)
+            data = f.read(stat.st_size - self.offset)
+        if len(self.head) < head_size:
+            self.head += data[:head_size - len(self.head)]
+        self.offset += len(data)
+        return data
+
+    def _consume_header(self, text):
+        # Skip comment lines up to the 'Time ...' header and return the text after it
+        lines = text.splitlines(keepends=True)
+        for i, line in enumerate(lines):
+            tokens = line.lstrip("#").split()
+            if tokens and tokens[0] == "Time":
+                missing = [q for q in self.quantities if q not in tokens]
+                if missing:
+                    raise KeyError(f"Columns {missing} not found in {self.path}; available: {tokens}")
+                self.columns = tokens
+                self.indices = [tokens.index(q) for q in self.quantities]
+                return "".join(lines[i + 1:])
+        return ""
+
+    def poll(self):
+        """
+        Return (time, values, restarted) for the rows appended since the last call.
+
+        values has shape (n, n_quantities). restarted is True if the file was rewritten
+        since the last call; the rows returned then belong to the new file only.
+        """
+        data = self.partial + self._read_new_bytes()
+        restarted, self.restarted = self.restarted, False
+        cut = data.rfind(b"\n") + 1
+        self.partial = data[cut:]
+        text = data[:cut].decode("latin-1")
+        if self.columns is None:
+            text = self._consume_header(text)
+        if self.columns is None or not text:
+            return np.empty(0), np.empty((0, len(self.quantities))), restarted
+        rows = parse_rows(text, len(self.columns))
+        return rows[:, 0], rows[:, self.indices], restarted
+
+
+class MovingWindow:
+    """Samples of the last `width` time units, for a trapezoidal moving average."""
+
+    def __init__(self, width, n_quantities):
+        self.width = width
+        self.time = np.empty(0)
+        self.values = np.empty((0, n_quantities))
+
+    def update(self, time, values):
+        self.time = np.concatenate((self.time, time))
+        self.values = np.concatenate((self.values, values))
+        start = np.searchsorted(self.time, self.time[-1] - self.width) if self.time.size else 0
+        self.time, self.values = self.time[start:], self.values[start:]
+
+    def mean(self):
+        if self.time.size < 2:
+            return np.full(self.values.shape[1], np.nan)
+        dt = np.diff(self.time)[:, None]
+        integral = ((self.values[:-1] + self.values[1:]) / 2 * dt).sum(axis=0)
+        return integral / (self.time[-1] - self.time[0])
+
+
+def _summary(name, quantities, cumulative, moving):
+    if cumulative.count == 0:
+        return f"{name}: waiting for data"
+    total = cumulative.result(quantities)
+    window = moving.mean()
+    parts = [f"{name}: t={cumulative.last_time:.6g}, rows={cumulative.count}"]
+    for k, quantity in enumerate(quantities):
+        parts.append(
+            f"{quantity} last={moving.values[-1, k]:.6g} mean={total[quantity]['average']:.6g} "
+            f"window mean={window[k]:.6g}"
+        )
+    return " | ".join(parts)
+
+
+def follow(paths, quantities=("Cl", "Cd"), window=0.5, interval=5.0, plot=False, once=False):
+    """
+    Follow growing forceCoeffs files and report running statistics every `interval` seconds.
+
+    For each file this keeps a cumulative trapezoidal mean (averaging.WindowStats) and a
+    moving-window mean over the last `window` time units. Only newly appended bytes are
+    parsed, so the cost of each refresh does not grow with the file length.
+    """
+    quantities = list(quantities)
+    followers = [CoeffsFollower(path, quantities) for path in paths]
+    cumulative = [WindowStats(len(quantities)) for _ in paths]
+    moving = [MovingWindow(window, len(quantities)) for _ in paths]
+    names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+
+    if plot:
+        plt.ion()
+        fig, axes = plt.subplots(len(quantities), 1, sharex=True, squeeze=False, figsize=(16, 9))
+        lines = [[axes[k, 0].plot([], [], label=name)[0] for name in names] for k in range(len(quantities))]
+        for k, quantity in enumerate(quantities):
+            axes[k, 0].set_ylabel(quantity)
+            axes[k, 0].grid(color='gray', linestyle='--', linewidth=0.5)
+        axes[0, 0].legend(loc="best")
+        axes[-1, 0].set_xlabel("Time")
+
+    while True:
+        for i, follower in enumerate(followers):
+            new_time, new_values, restarted = follower.poll()
+            if restarted:
+                # The file was rewritten: start the statistics again with the new run
+                cumulative[i] = WindowStats(len(quantities))
+                moving[i] = MovingWindow(window, len(quantities))
+            if new_time.size:
+                cumulative[i].update(new_time, new_values)
+                moving[i].update(new_time, new_values)
+            print(_summary(names[i], quantities, cumulative[i], moving[i]))
+
+        if plot:
+            for k in range(len(quantities)):
+                for i, line in enumerate(lines[k]):
+                    line.set_data(moving[i].time, moving[i].values[:, k])
+                axes[k, 0].relim()
+                axes[k, 0].autoscale_view()
+            fig.canvas.draw_idle()
+            plt.pause(0.01)
+
+        if once:
+            return cumulative, moving
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live Cl/Cd statistics of running forceCoeffs output.")
+    parser.add_argument("paths", nargs="+", help="forceCoeffs .dat files to follow")
+    parser.add_argument("--quantities", nargs="+", default=["Cl", "Cd"])
+    parser.add_argument("--window", type=float, default=0.5, help="Moving-window length in time units")
+    parser.add_argument("--interval", type=float, default=5.0, help="Refresh interval in seconds")
+    parser.add_argument("--plot", action="store_true", help="Show a live plot of the moving window")
+    parser.add_argument("--once", action="store_true", help="Report once and exit")
+    args = parser.parse_args()
+
+    try:
+        follow(args.paths, args.quantities, args.window, args.interval, args.plot, args.once)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
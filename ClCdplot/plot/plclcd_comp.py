@@ -1,5 +1,51 @@
+import numpy as np
 import matplotlib.pyplot as plt
 
+
+def decimate_minmax(x, y, n_bins, x_range=None):
+    """
+    M4 decimation: keep the first, last, minimum and maximum sample of each x bin.
+
+    With one bin per horizontal pixel the decimated line renders identically to the
+    full series, and every extremum (e.g. a gust-response peak) is kept exactly.
+    x must be non-decreasing; otherwise the data are returned unchanged.
+
+    Parameters:
+        x, y (array-like): Series to decimate.
+        n_bins (int): Number of bins, typically the plot width in pixels.
+        x_range (list, optional): [min, max] spanned by the bins (default: data range).
+
+    Returns:
+        (ndarray, ndarray): At most 4 * n_bins samples of the original series.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    finite = np.isfinite(x) & np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+    if x.size <= 4 * n_bins or np.any(np.diff(x) < 0):
+        return x, y
+
+    x_min, x_max = x_range if x_range else (x[0], x[-1])
+    scale = n_bins / (x_max - x_min) if x_max > x_min else 0.0
+    bins = np.clip(((x - x_min) * scale).astype(np.int64), 0, n_bins - 1)
+
+    # Segments of equal bin index (bins is non-decreasing because x is)
+    starts = np.flatnonzero(np.diff(bins)) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.concatenate((starts[1:], [x.size])) - 1
+    segment = np.repeat(np.arange(starts.size), np.diff(np.concatenate((starts, [x.size]))))
+
+    # First position of each segment's minimum and maximum, without a sort
+    keep = [starts, ends]
+    for reduce in (np.minimum, np.maximum):
+        hits = np.flatnonzero(y == reduce.reduceat(y, starts)[segment])
+        first = np.concatenate(([True], segment[hits][1:] != segment[hits][:-1]))
+        keep.append(hits[first])
+
+    selected = np.unique(np.concatenate(keep))
+    return x[selected], y[selected]
+
 def plot_coefficients_comparison(
     data_list,
     labels,
@@ -14,7 +60,8 @@ def plot_coefficients_comparison(
     grid,
     exp_marker=None,  # New parameter to accept marker settings for experimental data
     plot_lines=True,  # Flag to control line plotting
-    plot_markers=True  # Flag to control marker plotting
+    plot_markers=True,  # Flag to control marker plotting
+    decimate=False  # Reduce dense series to min/max per pixel column before plotting
 ):
     """
     Plot a comparison of coefficients (Cl or Cd) from multiple datasets with customizable line styles, colors, and transparency.
@@ -34,6 +81,8 @@ def plot_coefficients_comparison(
         exp_marker (dict, optional): Dictionary with marker customization for experimental data.
         plot_lines (bool): Whether to plot lines for experimental data (default True).
         plot_markers (bool): Whether to plot markers for experimental data (default True).
+        decimate (bool): Apply decimate_minmax to non-experimental series at the figure's
+            horizontal pixel resolution (default False). Peaks are kept exactly.
     """
     # Convert filename to LaTeX format for axis label
     latex_labels = {"Cl": r"$C_l$", "Cd": r"$C_d$"}
@@ -42,8 +91,9 @@ def plot_coefficients_comparison(
     y_label = latex_labels.get(filename, filename)  # Default to filename if not Cl or Cd
 
     # Create the plot
-    plt.figure(figsize=figsize)
+    fig = plt.figure(figsize=figsize)
     plt.title(figtitle, fontsize=16)
+    n_pixels = int(round(fig.get_figwidth() * fig.dpi))
 
     # Plot each dataset with specific style, color, and transparency
     for data, label, style, color, alpha in zip(data_list, labels, line_styles, line_colors, line_alphas):
@@ -79,9 +129,12 @@ def plot_coefficients_comparison(
                 )
         else:
             # For other datasets, use the specified line styles and colors
+            time, values = data["Time"], data[filename]
+            if decimate:
+                time, values = decimate_minmax(time, values, n_pixels, xrange)
             plt.plot(
-                data["Time"],
-                data[filename],
+                time,
+                values,
                 label=label,
                 linestyle=style,
                 color=color,
@@ -0,0 +1,238 @@
+# Run the postprocessing of many cases without user interaction.
+#
+# Every case is described by one config file (.json, .toml, or .yaml/.yml if PyYAML
+# is installed); see example_case.json. Relative paths in a config are relative to
+# the config file. For each case the stages load -> transform -> average -> plot run
+# in a worker process: every input file is read once, with the union of the columns
+# any product needs, and shared by the averages and all plots of the case.
+import os
+import sys
+import json
+import logging
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+import matplotlib
+
+matplotlib.use("Agg")  # Headless: plots are only written to files
+import matplotlib.pyplot as plt
+
+_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for _folder in (("ClCdplot", "plot"), ("ClCdplot", "averagevalue"), ("waves", "pack")):
+    sys.path.insert(0, os.path.join(_root, *_folder))
+from forcecoeffs_reader import read_force_coeffs, read_force_coeffs_restarts
+from averaging import WindowStats
+from file_processing import read_u_file
+from plotting import plot_velocity_data
+import plclcd
+
+custom_colors = ["green", "#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]
+plot_types = ("coefficients", "probes")
+
+
+def load_config(path):
+    """Read a case config from JSON, TOML or YAML, chosen by the file extension."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path) as f:
+            config = json.load(f)
+    elif ext == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    elif ext in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError(f"{path}: YAML configs need PyYAML (pip install pyyaml)") from None
+        with open(path) as f:
+            config = yaml.safe_load(f)
+    else:
+        raise ValueError(f"Unsupported config format: {path}")
+
+    for product in config.get("plots", []):
+        if product.get("type") not in plot_types:
+            raise ValueError(f"{path}: unknown plot type {product.get('type')!r}; use one of {plot_types}")
+
+    base = os.path.dirname(os.path.abspath(path))
+    config.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    config["output_dir"] = os.path.join(base, config.get("output_dir", os.path.join("results", config["name"])))
+    for key in ("force_coeffs", "probes"):
+        config[key] = [os.path.join(base, p) for p in config.get(key, [])]
+    return config
+
+
+def _needed_columns(config):
+    # Union of the forceCoeffs columns used by the averages and the plots
+    columns = ["Time"]
+    quantities = list(config.get("average", {}).get("quantities", []))
+    quantities += [plot["quantity"] for plot in config.get("plots", []) if plot["type"] == "coefficients"]
+    for quantity in quantities:
+        if quantity not in columns:
+            columns.append(quantity)
+    return columns
+
+
+def load_inputs(config):
+    """Load stage: read each input file of the case once."""
+    data = {"force_coeffs": None, "probes": []}
+    paths = config["force_coeffs"]
+    columns = _needed_columns(config)
+    use_cache = config.get("use_cache", True)
+    if paths and len(columns) > 1:
+        if len(paths) > 1:
+            # Restart fragments of one run
+            data["force_coeffs"] = read_force_coeffs_restarts(paths, columns, use_cache=use_cache)
+        else:
+            data["force_coeffs"] = read_force_coeffs(paths[0], columns, use_cache=use_cache)
+
+    for path in config["probes"]:
+        probe = read_u_file(path, config.get("freestream_velocity", 1.0), config.get("time_normalization", 1.0))
+        data["probes"].append((os.path.basename(path), probe))
+    return data
+
+
+def transform(config, data):
+    """Transform stage: time shift and velocity offsets of the normalized probe data."""
+    time_shift = config.get("time_shift", 0.0)
+    offsets = config.get("offsets", [0.0, 0.0, 0.0])
+    if time_shift or any(offsets):
+        shifted = []
+        for label, probe in data["probes"]:
+            probe = pd.DataFrame({
+                "Time": probe["Time"].to_numpy() + time_shift,
+                "Velocity_X": probe["Velocity_X"].to_numpy() + offsets[0],
+                "Velocity_Y": probe["Velocity_Y"].to_numpy() + offsets[1],
+                "Velocity_Z": probe["Velocity_Z"].to_numpy() + offsets[2],
+            })
+            shifted.append((label, probe))
+        data["probes"] = shifted
+    return data
+
+
+def average(config, data):
+    """Average stage: time-weighted statistics of the loaded forceCoeffs columns."""
+    settings = config.get("average")
+    coeffs = data["force_coeffs"]
+    if not settings or coeffs is None:
+        return []
+    quantities = list(settings.get("quantities", ["Cl", "Cd"]))
+    time = coeffs["Time"].to_numpy()
+    values = coeffs[quantities].to_numpy()
+
+    rows = []
+    for time_min, time_max in settings["windows"]:
+        stats = WindowStats(len(quantities), time_min, time_max)
+        stats.update(time, values)
+        for quantity, result in stats.result(quantities).items():
+            rows.append({"case": config["name"], "time_min": time_min, "time_max": time_max,
+                         "quantity": quantity, **result})
+    return rows
+
+
+def plot(config, data):
+    """Plot stage: write every requested figure of the case; returns the file names."""
+    output_dir = config["output_dir"]
+    files = []
+    for product in config.get("plots", []):
+        figsize = tuple(product.get("figsize", (16, 9)))
+        if product["type"] == "coefficients":
+            coeffs = data["force_coeffs"]
+            quantity = product["quantity"]
+            filename = os.path.join(output_dir, product.get("filename", quantity))
+            plclcd.plot_coefficients(
+                data=coeffs,
+                filename=filename,
+                figtitle=product.get("title", config["name"]),
+                figsize=figsize,
+                xrange=product.get("xrange", [coeffs["Time"].min(), coeffs["Time"].max()]),
+                yrange=product.get("yrange", [coeffs[quantity].min(), coeffs[quantity].max()]),
+                linecolor=product.get("color", "cornflowerblue"),
+                grid=product.get("grid", True),
+                indicator_lines=product.get("indicator_lines"),
+                show_indicators=bool(product.get("indicator_lines")),
+                quantity=quantity,
+                show=False,
+            )
+            files.append(f"{filename}.pdf")
+        elif product["type"] == "probes":
+            component = product.get("component", "z")
+            filename = os.path.join(output_dir, product.get("filename", f"probes_{component}"))
+            plt.figure(figsize=figsize)
+            labels = [label for label, _ in data["probes"]]
+            plot_velocity_data([probe for _, probe in data["probes"]], labels, component, custom_colors)
+            plt.title(product.get("title", config["name"]))
+            plt.xlabel("$t/T$")
+            plt.ylabel(f"$v/U$ for {component.upper()}-direction")
+            plt.grid(product.get("grid", True))
+            plt.legend(loc="best")
+            plt.savefig(f"{filename}.pdf", bbox_inches="tight", format="pdf")
+            files.append(f"{filename}.pdf")
+        plt.close("all")
+    return files
+
+
+def run_case(config_path):
+    """Run all stages of one case; errors are reported instead of raised."""
+    try:
+        config = load_config(config_path)
+        os.makedirs(config["output_dir"], exist_ok=True)
+        data = transform(config, load_inputs(config))
+        rows = average(config, data)
+        if rows:
+            pd.DataFrame(rows).to_csv(os.path.join(config["output_dir"], "averages.csv"), index=False)
+        files = plot(config, data)
+        return {"config": config_path, "ok": True, "rows": rows, "files": files}
+    except Exception:
+        return {"config": config_path, "ok": False, "error": traceback.format_exc()}
+
+
+def run_cases(config_paths, processes=None):
+    """Run many cases in a process pool and yield their results as they finish."""
+    if processes == 1:
+        yield from map(run_case, config_paths)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(run_case, path) for path in config_paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless postprocessing of many cases, one config file per case.")
+    parser.add_argument("configs", nargs="+", help="Case config files (.json, .toml, .yaml)")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--summary", default="averages_summary.csv",
+                        help="Averages of all cases (default: averages_summary.csv)")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        filename="pipeline_log.txt",
+        level=logging.INFO,
+        format="%(asctime)s - %(message)s",
+        filemode="w",
+    )
+
+    rows = []
+    failed = 0
+    for done, result in enumerate(run_cases(args.configs, args.processes), start=1):
+        if result["ok"]:
+            rows.extend(result["rows"])
+            logging.info(f"{result['config']}: wrote {result['files']}")
+            print(f"[{done}/{len(args.configs)}] {result['config']}: done")
+        else:
+            failed += 1
+            logging.error(f"{result['config']} failed:\n{result['error']}")
+            print(f"[{done}/{len(args.configs)}] {result['config']}: FAILED (see pipeline_log.txt)")
+
+    if rows:
+        pd.DataFrame(rows).to_csv(args.summary, index=False)
+        print(f"Averages of all cases saved to {args.summary}")
+    if failed:
+        print(f"{failed} of {len(args.configs)} cases failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
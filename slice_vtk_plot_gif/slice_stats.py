@@ -0,0 +1,132 @@
+import argparse
+import numpy as np
+from multiprocessing import Pool
+from slice_vtk_plot_gif import find_slices, read_slice, slice_time
+
+
+def _magnitude(values):
+    if values.ndim == 2:
+        return np.sqrt(np.einsum("ij,ij->i", values, values))
+    return values
+
+
+def slice_statistics(mesh, fields=("U", "p"), freestream_velocity=None, wake_x_min=None):
+    """
+    Area-weighted statistics of one slice.
+
+    For every field this gives the cell-area-weighted mean and the min/max of the
+    field (magnitude for vectors). Cell data is integrated as is; point data is first
+    averaged onto the cells. The extrema are taken over the stored values.
+
+    With freestream_velocity and wake_x_min, the wake deficit 1 - Ux/U_inf is added for
+    the cells downstream of x = wake_x_min: its area-weighted mean and its maximum.
+
+    Returns:
+        dict: {"Area", "<field>_mean", "<field>_min", "<field>_max", ...}; NaN for
+        fields missing in the slice.
+    """
+    areas = mesh.compute_cell_sizes(length=False, area=True, volume=False).cell_data["Area"]
+    total_area = areas.sum()
+    cell_mesh = None
+    row = {"Area": float(total_area)}
+
+    for field in fields:
+        if field in mesh.cell_data:
+            values = cell_values = np.asarray(mesh.cell_data[field])
+        elif field in mesh.point_data:
+            if cell_mesh is None:
+                cell_mesh = mesh.point_data_to_cell_data()
+            values = np.asarray(mesh.point_data[field])
+            cell_values = np.asarray(cell_mesh.cell_data[field])
+        else:
+            row.update({f"{field}_mean": np.nan, f"{field}_min": np.nan, f"{field}_max": np.nan})
+            continue
+        values = _magnitude(values)
+        row[f"{field}_mean"] = float(areas @ _magnitude(cell_values) / total_area)
+        row[f"{field}_min"] = float(values.min())
+        row[f"{field}_max"] = float(values.max())
+
+    if freestream_velocity is not None and wake_x_min is not None:
+        if "U" in mesh.cell_data:
+            velocity = np.asarray(mesh.cell_data["U"])
+        else:
+            if cell_mesh is None:
+                cell_mesh = mesh.point_data_to_cell_data()
+            velocity = np.asarray(cell_mesh.cell_data["U"])
+        wake = mesh.cell_centers().points[:, 0] >= wake_x_min
+        if wake.any():
+            deficit = 1 - velocity[wake, 0] / freestream_velocity
+            row["wake_deficit_mean"] = float(areas[wake] @ deficit / areas[wake].sum())
+            row["wake_deficit_max"] = float(deficit.max())
+        else:
+            row["wake_deficit_mean"] = row["wake_deficit_max"] = np.nan
+    return row
+
+
+def _statistics_task(args):
+    source, fields, freestream_velocity, wake_x_min = args
+    mesh = read_slice(source)
+    return slice_time(source), slice_statistics(mesh, fields, freestream_velocity, wake_x_min)
+
+
+def extract_statistics(sources, output_file, fields=("U", "p"), freestream_velocity=None,
+                       wake_x_min=None, processes=None):
+    """
+    Write per-time-step slice statistics to a whitespace-separated table.
+
+    The table has a '# Time ...' header like forceCoeffs output, so it can be loaded
+    with forcecoeffs_reader.read_force_coeffs and plotted next to the force data.
+    Time steps are processed in a process pool and rows are written in time order as
+    they complete.
+
+    Parameters:
+        sources (list): Time steps from find_slices (.vtp files or a slice store).
+        output_file (str): Path of the table.
+        fields (tuple): Fields to integrate.
+        freestream_velocity (float, optional): U_inf for the wake deficit.
+        wake_x_min (float, optional): Start of the wake region for the wake deficit.
+        processes (int, optional): Worker processes; None uses all cores, 1 runs serially.
+    """
+    tasks = [(source, tuple(fields), freestream_velocity, wake_x_min) for source in sources]
+    with open(output_file, "w") as f:
+        if processes == 1:
+            _write_rows(f, map(_statistics_task, tasks), len(tasks))
+        else:
+            with Pool(processes) as pool:
+                _write_rows(f, pool.imap(_statistics_task, tasks, chunksize=8), len(tasks))
+
+
+def _write_rows(f, results, n_rows):
+    columns = None
+    for i, (time, row) in enumerate(results):
+        if columns is None:
+            columns = list(row)
+            f.write("# Time " + " ".join(columns) + "\n")
+        f.write(" ".join(f"{value:.10g}" for value in [time] + [row[c] for c in columns]) + "\n")
+        if (i + 1) % 100 == 0 or i + 1 == n_rows:
+            print(f"[{i+1}/{n_rows}] Processed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Area-weighted statistics of every slice of a time series.")
+    parser.add_argument("base_path", help="Directory of <time>/midPlaneXZ.vtp files or a slice store")
+    parser.add_argument("--fields", nargs="+", default=["U", "p"], help="Fields to integrate (default: U p)")
+    parser.add_argument("--freestream-velocity", type=float, help="U_inf for the wake deficit")
+    parser.add_argument("--wake-x-min", type=float, help="Cells with x >= this form the wake region")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--output", default="slice_statistics.dat", help="Output table")
+    parser.add_argument("--time-min", type=float, help="First time to use")
+    parser.add_argument("--time-max", type=float, help="Last time to use")
+    parser.add_argument("--stride", type=int, default=1, help="Use every n-th selected time step")
+    args = parser.parse_args()
+
+    sources = find_slices(args.base_path, args.time_min, args.time_max, args.stride)
+    print(f"Found {len(sources)} VTK files.")
+    extract_statistics(
+        sources, args.output, args.fields, args.freestream_velocity, args.wake_x_min, args.processes
+    )
+    print(f"Statistics saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import os
+import json
+import shutil
+import argparse
+import numpy as np
+import pyvista as pv
+
+# A slice store is a directory holding the topology once and every field of every
+# time step in one (n_times, n_values[, n_components]) .npy array, read by memory
+# mapping so any frame or field is available without opening the original files
+_meta_name = "store.json"
+
+
+def meta_path(path):
+    """Metadata file of the slice store at path."""
+    return os.path.join(path, _meta_name)
+
+
+def is_slice_store(path):
+    return os.path.exists(meta_path(path))
+
+
+def _array_file(association, name):
+    return f"{association}_{name}.npy"
+
+
+def _topology_arrays(mesh):
+    return {kind: np.asarray(getattr(mesh, kind)) for kind in ("verts", "lines", "faces", "strips")}
+
+
+def _write_series(vtk_files, first, topology, arrays, tmp):
+    n_times = len(vtk_files)
+    for kind, values in topology.items():
+        np.save(os.path.join(tmp, f"{kind}.npy"), values)
+    np.save(os.path.join(tmp, "points.npy"), np.asarray(first.points))
+    series = {
+        (association, name): np.lib.format.open_memmap(
+            os.path.join(tmp, _array_file(association, name)), mode="w+",
+            dtype=values.dtype, shape=(n_times,) + values.shape,
+        )
+        for association, name, values in arrays
+    }
+    moving_points = None
+
+    for i, file in enumerate(vtk_files):
+        mesh = first if i == 0 else pv.read(file)
+        if i and any(not np.array_equal(values, getattr(mesh, kind)) for kind, values in topology.items()):
+            raise ValueError(f"Topology of {file} differs from {vtk_files[0]}")
+
+        if moving_points is None and not np.array_equal(mesh.points, first.points):
+            moving_points = np.lib.format.open_memmap(
+                os.path.join(tmp, "points_series.npy"), mode="w+",
+                dtype=first.points.dtype, shape=(n_times,) + first.points.shape,
+            )
+            moving_points[:i] = first.points
+        if moving_points is not None:
+            moving_points[i] = mesh.points
+
+        for (association, name), target in series.items():
+            data = mesh.point_data if association == "point" else mesh.cell_data
+            if name not in data:
+                raise ValueError(f"{association} array '{name}' missing in {file}")
+            target[i] = data[name]
+
+    for target in series.values():
+        target.flush()
+    if moving_points is not None:
+        moving_points.flush()
+
+
+def convert_series(vtk_files, times, store_dir, fields=None):
+    """
+    Pack a series of slices with a common topology into a slice store.
+
+    Parameters:
+        vtk_files (list): .vtp files in time order.
+        times (list): Time of each file.
+        store_dir (str): Output directory; an existing store there is replaced, any
+            other existing file or directory raises FileExistsError.
+        fields (list, optional): Array names to keep (default: all point and cell arrays
+            of the first file).
+
+    Point coordinates are stored once, or per time step if they change (moving mesh).
+    Raises ValueError if the connectivity or the available arrays change over the series.
+    """
+    # Never delete what convert_series did not write
+    if os.path.lexists(store_dir) and not is_slice_store(store_dir):
+        raise FileExistsError(f"{store_dir} exists and is not a slice store")
+
+    first = pv.read(vtk_files[0])
+    topology = _topology_arrays(first)
+    arrays = []
+    for association, data in (("point", first.point_data), ("cell", first.cell_data)):
+        for name in data.keys():
+            if fields is None or name in fields:
+                arrays.append((association, name, np.asarray(data[name])))
+    if not arrays:
+        raise ValueError(f"None of the fields {fields} found in {vtk_files[0]}")
+
+    tmp = f"{store_dir}.tmp{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    try:
+        _write_series(vtk_files, first, topology, arrays, tmp)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    # The metadata file is written last: its presence marks a complete store
+    meta = {
+        "times": [float(t) for t in times],
+        "files": [os.path.abspath(file) for file in vtk_files],
+        "arrays": [[association, name] for association, name, _ in arrays],
+        "moving_points": os.path.exists(os.path.join(tmp, "points_series.npy")),
+    }
+    try:
+        with open(meta_path(tmp), "w") as f:
+            json.dump(meta, f)
+        if is_slice_store(store_dir):
+            shutil.rmtree(store_dir)
+        os.replace(tmp, store_dir)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+class SliceStore:
+    """
+    Random access to the frames and fields of a slice store written by convert_series.
+
+    Arrays are memory-mapped, so opening a store is cheap and only the values actually
+    used are read from disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(meta_path(path)) as f:
+            meta = json.load(f)
+        self.times = np.array(meta["times"])
+        self.files = meta["files"]
+        self.arrays = [tuple(entry) for entry in meta["arrays"]]
+        self.topology = {
+            kind: np.load(os.path.join(path, f"{kind}.npy"))
+            for kind in ("verts", "lines", "faces", "strips")
+        }
+        if meta["moving_points"]:
+            self.points = np.load(os.path.join(path, "points_series.npy"), mmap_mode="r")
+        else:
+            self.points = np.load(os.path.join(path, "points.npy"), mmap_mode="r")
+        self.moving_points = meta["moving_points"]
+        self._series = {}
+
+    def __len__(self):
+        return len(self.times)
+
+    def field(self, name, association=None):
+        """
+        Memory-mapped (n_times, n_values[, n_components]) array of a field.
+
+        With association None, point data is preferred over cell data.
+        """
+        for candidate in ((association,) if association else ("point", "cell")):
+            if (candidate, name) in self.arrays:
+                key = (candidate, name)
+                if key not in self._series:
+                    self._series[key] = np.load(
+                        os.path.join(self.path, _array_file(*key)), mmap_mode="r"
+                    )
+                return self._series[key]
+        raise KeyError(f"Field '{name}' not found in {self.path}; available: {self.arrays}")
+
+    def frame_points(self, index):
+        return self.points[index] if self.moving_points else self.points
+
+    def index(self, time):
+        """Index of the time step closest to time."""
+        return int(np.abs(self.times - time).argmin())
+
+    def mesh(self, index, fields=None):
+        """PolyData of one time step with the requested fields (default: all)."""
+        # Passing the cell arrays up front keeps PolyData from adding a vertex per point
+        cells = {kind: values for kind, values in self.topology.items() if values.size}
+        mesh = pv.PolyData(np.array(self.frame_points(index)), **cells)
+        for association, name in self.arrays:
+            if fields is None or name in fields:
+                data = mesh.point_data if association == "point" else mesh.cell_data
+                data[name] = np.array(self.field(name, association)[index])
+        return mesh
+
+
+_open_stores = {}
+
+
+def open_store(path):
+    """SliceStore of path, opened once per process."""
+    if path not in _open_stores:
+        _open_stores[path] = SliceStore(path)
+    return _open_stores[path]
+
+
+def main():
+    # Discovery is shared with the animator
+    from slice_vtk_plot_gif import find_vtk_files
+
+    parser = argparse.ArgumentParser(description="Pack a midPlaneXZ slice series into a slice store.")
+    parser.add_argument("base_path", help="Directory with one <time>/midPlaneXZ.vtp per time step")
+    parser.add_argument("store_dir", help="Output slice store directory")
+    parser.add_argument("--fields", nargs="+", help="Arrays to keep (default: all)")
+    parser.add_argument("--time-min", type=float, help="First time to use")
+    parser.add_argument("--time-max", type=float, help="Last time to use")
+    parser.add_argument("--stride", type=int, default=1, help="Use every n-th selected time step")
+    args = parser.parse_args()
+
+    vtk_files = find_vtk_files(args.base_path, args.time_min, args.time_max, args.stride)
+    times = [float(os.path.basename(os.path.dirname(file))) for file in vtk_files]
+    print(f"Packing {len(vtk_files)} VTK files into {args.store_dir}")
+    convert_series(vtk_files, times, args.store_dir, args.fields)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,656 @@
 import pyvista as pv
 import imageio
 import numpy as np
-import glob
+import hashlib
+import io
+import itertools
+import json
 import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
+from PIL import Image
+
+# Content hashing and the shared cache location live in waves/pack
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "waves", "pack"))
+from cache import cache_dir as _cache_root, file_digest
+from slice_store import is_slice_store, meta_path, open_store
+from time_index import find_time_files, select_times
 
 # Choose which field to plot: "U" or "p"
 plot_field = "U"
 
+# Directory of <time>/midPlaneXZ.vtp files, or a slice store written by slice_store.py
 base_path = "/Users/minghan/Downloads/pitch_heave/heaving/postProcessing/midPlaneXZ"
-vtk_files = sorted(
-    glob.glob(os.path.join(base_path, "*/midPlaneXZ.vtp")),
-    key=lambda x: float(os.path.basename(os.path.dirname(x)))
-)
-
-print(f"Found {len(vtk_files)} VTK files.")
+# .gif, .mp4/.webm (needs imageio-ffmpeg) or a directory name for a PNG sequence
+output_file = "velocity_animation.gif"
+fps = 10
 
-plotter = pv.Plotter(off_screen=True, window_size=(1920, 1080))  # HD
-frames = []
+# Optional: time steps to animate, e.g. every 5th step between t=1 and t=2
+time_min = None
+time_max = None
+time_stride = 1
 
 # Optional: consistent scalar range across frames
-scalar_range = None  # e.g., (0, 20) if you want to lock it
+# None autoscales every frame; a tuple such as (0, 20) locks it; "minmax" or
+# "robust" (1st-99th percentile) locks it to a range computed by a pre-pass
+# over all files (cached per dataset)
+scalar_range = None
+
+# Rendering settings shared by the serial and parallel modes
+render_settings = {
+    "plot_field": plot_field,
+    "cmap": "jet",
+    "window_size": (1920, 1080),  # HD
+    "camera_position": [(0, -2, 0), (0, 0, 0), (0, 0, 1)],
+    "scalar_range": scalar_range,
+}
+
+# Animations rendered from a single read of each file. Every entry overrides
+# render_settings and writes its own output file, for example
+# outputs = [
+#     {"output_file": "velocity_animation.gif"},
+#     {"output_file": "pressure_animation.gif", "plot_field": "p", "cmap": "coolwarm"},
+#     {"output_file": "velocity_top.mp4", "camera_position": [(0, 0, 2), (0, 0, 0), (0, 1, 0)]},
+# ]
+outputs = [{"output_file": output_file}]
+
+# Worker processes for rendering; 1 renders serially in this process
+n_workers = 1
+frames_per_task = 8  # Consecutive frames handed to a worker at a time
+
+# Directory of rendered frames reused by later runs (None disables the cache);
+# frames are keyed by the .vtp content and render_settings, so a rerun only
+# renders new or changed time steps
+frame_cache_dir = None
+
+# Files read (and derived fields computed) ahead of the renderer by reader threads;
+# at most prefetch_depth meshes are held in memory, 0 reads inline
+prefetch_depth = 4
+reader_threads = 2
 
-for i, file in enumerate(vtk_files):
-    print(f"[{i+1}/{len(vtk_files)}] Processing: {file}")
-    mesh = pv.read(file)
 
-    # Compute U magnitude if not already in the file
+def find_vtk_files(base_path, time_min=None, time_max=None, stride=1):
+    """midPlaneXZ.vtp files of the selected numeric time directories, in time order."""
+    return find_time_files(base_path, "midPlaneXZ.vtp", time_min, time_max, stride)
+
+
+def scalar_field_name(mesh, plot_field):
+    """Name of the array to plot for plot_field, computing U magnitude if needed; None if missing."""
     if plot_field == "U" and "U" in mesh.array_names:
         if "U_Magnitude" not in mesh.array_names:
             mesh["U_Magnitude"] = np.linalg.norm(mesh["U"], axis=1)
-        scalar_field = "U_Magnitude"
-    elif plot_field == "p" and "p" in mesh.array_names:
-        scalar_field = "p"
-    else:
+        return "U_Magnitude"
+    if plot_field == "p" and "p" in mesh.array_names:
+        return "p"
+    return None
+
+
+def find_slices(base_path, time_min=None, time_max=None, stride=1):
+    """
+    Selected time steps under base_path in time order: .vtp file paths, or
+    (store, index) pairs if base_path is a slice store.
+    """
+    if is_slice_store(base_path):
+        times = enumerate(open_store(base_path).times)
+        selected = select_times([(time, i) for i, time in times], time_min, time_max, stride)
+        return [(base_path, i) for _, i in selected]
+    return find_vtk_files(base_path, time_min, time_max, stride)
+
+
+def slice_time(source):
+    """Simulation time of a time step given as a .vtp path or a (store, index) pair."""
+    if isinstance(source, str):
+        return float(os.path.basename(os.path.dirname(source)))
+    store, index = source
+    return float(open_store(store).times[index])
+
+
+def read_slice(source):
+    """Mesh of a time step given as a .vtp path or a (store, index) pair."""
+    if isinstance(source, str):
+        return pv.read(source)
+    store, index = source
+    return open_store(store).mesh(index)
+
+
+def prepare_mesh(file, plot_field):
+    """Read a slice and return (mesh, scalar_field), or None if the field is missing."""
+    mesh = read_slice(file)
+    scalar_field = scalar_field_name(mesh, plot_field)
+    if scalar_field is None:
         print(f"No usable field '{plot_field}' found in:", file)
-        continue
-
-    plotter.clear()
-
-    plotter.add_mesh(
-        mesh,
-        scalars=scalar_field,
-        cmap="jet",
-        show_scalar_bar=True,
-        show_edges=True,
-        edge_color='black',
-        opacity=0.85,
-        scalar_bar_args={
-            "title": f"{plot_field}",
-            "title_font_size": 30,
-            "label_font_size": 24,
-            "n_labels": 4,               # Number of ticks
-            "vertical": True,            # Orientation
-            "position_x": 0.2,          # X position
-            "position_y": 0.25,          # Y position
-            "width": 0.04,               # Colorbar width
-            "height": 0.5,               # Colorbar height
-            "color": "white",            # Colorbar color
-        },
-    )
-
-    # Camera position
-    plotter.set_focus((0, 0, 0))
-    plotter.camera_position = [(0, -2, 0), (0, 0, 0), (0, 0, 1)]
-    plotter.reset_camera_clipping_range()
-
-    img = plotter.screenshot(return_img=True)
-    frames.append(img)
-
-if frames:
-    imageio.mimsave("velocity_animation.gif", frames, fps=10)
-    print("Animation saved as velocity_animation.gif")
-else:
-    print(" No frames collected. Check VTK contents.")
\ No newline at end of file
+        return None
+    return mesh, scalar_field
+
+
+def read_field(file, plot_field):
+    """
+    Read only the array of plot_field from a slice and return its values, with
+    vectors reduced to their magnitude; None if the field is missing.
+    """
+    # Same association the renderer ends up using: mesh["U"] prefers cell data,
+    # add_mesh(scalars="p") prefers point data
+    point_first = plot_field != "U"
+    values = None
+    if isinstance(file, str):
+        reader = pv.get_reader(file)
+        reader.disable_all_point_arrays()
+        reader.disable_all_cell_arrays()
+        for on_points in (point_first, not point_first):
+            names = reader.point_array_names if on_points else reader.cell_array_names
+            if plot_field in names:
+                if on_points:
+                    reader.enable_point_array(plot_field)
+                else:
+                    reader.enable_cell_array(plot_field)
+                values = np.asarray(reader.read()[plot_field])
+                break
+    else:
+        store, index = file
+        store = open_store(store)
+        for association in (("point", "cell") if point_first else ("cell", "point")):
+            if (association, plot_field) in store.arrays:
+                values = np.asarray(store.field(plot_field, association)[index])
+                break
+
+    if values is not None and values.ndim == 2:
+        values = np.sqrt(np.einsum("ij,ij->i", values, values))
+    return values
+
+
+def _source_identity(source):
+    # Path, size and mtime of a .vtp file, or of the store for a (store, index) pair
+    if isinstance(source, str):
+        stat = os.stat(source)
+        return [os.path.abspath(source), stat.st_size, stat.st_mtime_ns]
+    store, index = source
+    stat = os.stat(meta_path(store))
+    return [os.path.abspath(store), index, stat.st_size, stat.st_mtime_ns]
+
+
+def _field_summary(args):
+    file, plot_field, sample_size = args
+    values = read_field(file, plot_field)
+    if values is None or not values.size:
+        return None
+    step = max(1, values.size // sample_size)
+    return float(values.min()), float(values.max()), values[::step]
+
+
+def global_scalar_range(vtk_files, plot_field, n_workers=1, sample_size=20000, cache_dir=None):
+    """
+    Global min/max and robust (1st/99th percentile) range of a field over all files.
+
+    Each file contributes its exact min/max and an evenly strided sample of at most
+    sample_size values for the percentiles. Results are cached as JSON in cache_dir
+    (default: scalar_ranges/ under the shared cache location, so nothing is written
+    into the dataset), keyed by the field and the paths, sizes and mtimes of the
+    files, so a second call does not read the files again.
+
+    Returns:
+        dict: {"min", "max", "p1", "p99"}
+    """
+    key = hashlib.sha1(json.dumps(
+        [plot_field, sample_size] + [_source_identity(source) for source in vtk_files]
+    ).encode()).hexdigest()
+    cache_dir = os.path.join(_cache_root, "scalar_ranges") if cache_dir is None else cache_dir
+    cache_file = os.path.join(cache_dir, f"{plot_field}_{key[:16]}.json")
+    if os.path.exists(cache_file):
+        with open(cache_file) as f:
+            return json.load(f)
+
+    tasks = [(file, plot_field, sample_size) for file in vtk_files]
+    if n_workers <= 1:
+        summaries = list(map(_field_summary, tasks))
+    else:
+        with Pool(n_workers) as pool:
+            summaries = pool.map(_field_summary, tasks, chunksize=16)
+    summaries = [summary for summary in summaries if summary is not None]
+    if not summaries:
+        raise ValueError(f"Field '{plot_field}' not found in any VTK file.")
+
+    sample = np.concatenate([summary[2] for summary in summaries])
+    p1, p99 = np.percentile(sample, [1, 99])
+    result = {
+        "min": min(summary[0] for summary in summaries),
+        "max": max(summary[1] for summary in summaries),
+        "p1": float(p1),
+        "p99": float(p99),
+    }
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(result, f)
+    except OSError:
+        pass  # Read-only cache location
+    return result
+
+
+def topology_signature(mesh):
+    """Point/cell counts plus a hash of the cell connectivity."""
+    cells = mesh.faces if isinstance(mesh, pv.PolyData) else mesh.cells
+    digest = hashlib.blake2b(np.ascontiguousarray(cells).tobytes(), digest_size=16).hexdigest()
+    return mesh.n_points, mesh.n_cells, digest
+
+
+class SliceRenderer:
+    """
+    Off-screen plotter that rebuilds the scene only when the slice topology changes.
+
+    While consecutive meshes have the same connectivity, the actor from the previous
+    frame is kept and only its scalar array (and point coordinates, for moving meshes)
+    is replaced before taking the screenshot.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.plotter = pv.Plotter(off_screen=True, window_size=settings["window_size"])
+        self.mesh = None  # Mesh bound to the current actor
+        self.actor = None
+        self.scalar_field = None
+        self.signature = None
+
+    def render(self, mesh, scalar_field):
+        signature = topology_signature(mesh)
+        if self.actor is not None and signature == self.signature and scalar_field == self.scalar_field:
+            self._update(mesh, scalar_field)
+        else:
+            self._rebuild(mesh, scalar_field)
+            self.signature = signature
+        return self.plotter.screenshot(return_img=True)
+
+    def _update(self, mesh, scalar_field):
+        if not np.array_equal(self.mesh.points, mesh.points):
+            self.mesh.points = mesh.points
+            self.plotter.reset_camera_clipping_range()
+
+        # Same association add_mesh uses: point data first, then cell data
+        if scalar_field in mesh.point_data:
+            self.mesh.point_data[scalar_field] = mesh.point_data[scalar_field]
+        else:
+            self.mesh.cell_data[scalar_field] = mesh.cell_data[scalar_field]
+        if self.settings["scalar_range"] is None:
+            # Autoscale per frame, as a full rebuild would
+            values = self.mesh.get_array(scalar_field, preference="point")
+            self.actor.mapper.scalar_range = (float(np.min(values)), float(np.max(values)))
+
+        self.mesh.Modified()
+        self.plotter.render()
+
+    def _rebuild(self, mesh, scalar_field):
+        settings = self.settings
+        plotter = self.plotter
+        plotter.clear()
+
+        # Shallow copy: later in-place updates must not alter the caller's mesh
+        mesh = mesh.copy(deep=False)
+        self.actor = plotter.add_mesh(
+            mesh,
+            scalars=scalar_field,
+            cmap=settings["cmap"],
+            clim=settings["scalar_range"],
+            show_scalar_bar=True,
+            show_edges=True,
+            edge_color='black',
+            opacity=0.85,
+            scalar_bar_args={
+                "title": f"{settings['plot_field']}",
+                "title_font_size": 30,
+                "label_font_size": 24,
+                "n_labels": 4,               # Number of ticks
+                "vertical": True,            # Orientation
+                "position_x": 0.2,          # X position
+                "position_y": 0.25,          # Y position
+                "width": 0.04,               # Colorbar width
+                "height": 0.5,               # Colorbar height
+                "color": "white",            # Colorbar color
+            },
+        )
+        self.mesh = mesh
+        self.scalar_field = scalar_field
+
+        # Camera position
+        plotter.set_focus((0, 0, 0))
+        plotter.camera_position = settings["camera_position"]
+        plotter.reset_camera_clipping_range()
+
+
+def source_digest(source):
+    """Content hash of a time step given as a .vtp path or a (store, index) pair."""
+    if isinstance(source, str):
+        return file_digest(source)
+    store, index = source
+    store = open_store(store)
+    digest = hashlib.blake2b(np.ascontiguousarray(store.frame_points(index)).tobytes(), digest_size=20)
+    for association, name in store.arrays:
+        digest.update(np.ascontiguousarray(store.field(name, association)[index]).tobytes())
+    return digest.hexdigest()
+
+
+def frame_key(digest, settings):
+    """Cache key of a frame: the slice file digest and the render settings that affect the image."""
+    return hashlib.blake2b(
+        (digest + json.dumps(settings, sort_keys=True, default=str)).encode(), digest_size=20
+    ).hexdigest()
+
+
+class StageTimer:
+    """Wall time accumulated per pipeline stage, safe to update from reader threads."""
+
+    def __init__(self):
+        self.seconds = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self.lock:
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def merge(self, seconds):
+        for stage, value in seconds.items():
+            self.add(stage, value)
+
+    def report(self):
+        # read runs in background threads, so it overlaps the other stages; a large
+        # wait means the renderer is starved by I/O, a small one that it is render bound
+        return ", ".join(f"{stage} {value:.2f} s" for stage, value in self.seconds.items())
+
+
+def load_slice(file, settings_list, cache_dir=None):
+    """
+    Reading stage of the pipeline: return (cache_files, frames, fields, mesh).
+
+    One entry per settings in settings_list: frames holds the cached image if this
+    file was already rendered with those settings (frames are cached in cache_dir as
+    <key>.png), fields the array to plot otherwise (None if the field is missing).
+    The file is read at most once, and only if some frame is not cached.
+    """
+    cache_files = [None] * len(settings_list)
+    frames = [None] * len(settings_list)
+    if cache_dir:
+        digest = source_digest(file)
+        for i, settings in enumerate(settings_list):
+            cache_files[i] = os.path.join(cache_dir, f"{frame_key(digest, settings)}.png")
+            if os.path.exists(cache_files[i]):
+                frames[i] = np.asarray(Image.open(cache_files[i]))
+
+    fields = [None] * len(settings_list)
+    mesh = None
+    if any(frame is None for frame in frames):
+        mesh = read_slice(file)
+        for i, settings in enumerate(settings_list):
+            if frames[i] is None:
+                fields[i] = scalar_field_name(mesh, settings["plot_field"])
+                if fields[i] is None:
+                    print(f"No usable field '{settings['plot_field']}' found in:", file)
+    return cache_files, frames, fields, mesh
+
+
+def render_loaded(renderers, loaded):
+    """Rendering stage: turn the result of load_slice into one frame (or None) per renderer."""
+    cache_files, frames, fields, mesh = loaded
+    frames = list(frames)
+    for i, renderer in enumerate(renderers):
+        if frames[i] is not None or fields[i] is None:
+            continue
+        frames[i] = renderer.render(mesh, fields[i])
+
+        if cache_files[i]:
+            os.makedirs(os.path.dirname(cache_files[i]), exist_ok=True)
+            tmp = f"{cache_files[i]}.tmp{os.getpid()}.png"
+            Image.fromarray(frames[i]).save(tmp, compress_level=1)
+            os.replace(tmp, cache_files[i])
+    return frames
+
+
+def render_file(renderer, file, cache_dir=None):
+    """Render one slice, or load the frame from cache_dir if it was already rendered."""
+    return render_loaded([renderer], load_slice(file, [renderer.settings], cache_dir))[0]
+
+
+def prefetch(function, items, depth, n_threads=2):
+    """
+    Yield function(item) for every item in order, computed by a thread pool up to
+    `depth` items ahead of the consumer; depth <= 0 computes them inline.
+
+    At most `depth` results are held at once, which bounds the memory use.
+    """
+    if depth <= 0:
+        yield from map(function, items)
+        return
+
+    items = iter(items)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        for item in itertools.islice(items, depth):
+            pending.append(pool.submit(function, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in itertools.islice(items, 1):
+                pending.append(pool.submit(function, item))
+            yield result
+
+
+def _render_files(renderers, files, cache_dir, timer, progress=False):
+    settings_list = [renderer.settings for renderer in renderers]
+
+    def load(file):
+        start = time.perf_counter()
+        loaded = load_slice(file, settings_list, cache_dir)
+        timer.add("read", time.perf_counter() - start)
+        return loaded
+
+    loaded_iter = prefetch(load, files, prefetch_depth, reader_threads)
+    for i, file in enumerate(files):
+        start = time.perf_counter()
+        loaded = next(loaded_iter)
+        timer.add("wait", time.perf_counter() - start)
+        if progress:
+            print(f"[{i+1}/{len(files)}] Processing: {file}")
+
+        start = time.perf_counter()
+        frames = render_loaded(renderers, loaded)
+        timer.add("render", time.perf_counter() - start)
+        yield frames
+
+
+# Per-process state of the parallel render workers
+_worker = {}
+
+
+def _init_worker(settings_list, cache_dir):
+    _worker["renderers"] = [SliceRenderer(settings) for settings in settings_list]
+    _worker["cache_dir"] = cache_dir
+
+
+def _render_task(files):
+    timer = StageTimer()
+    frames = list(_render_files(_worker["renderers"], files, _worker["cache_dir"], timer))
+    return frames, timer.seconds
+
+
+def iter_frames(vtk_files, settings_list, n_workers=1, cache_dir=None, timer=None):
+    """
+    Yield, in time order, a list with one rendered frame per settings in settings_list
+    (None where the field is missing). Each file is read once for all settings, which
+    are rendered by their own off-screen plotters.
+
+    Files are read and their derived fields computed by reader threads up to
+    prefetch_depth files ahead, so I/O overlaps rendering. With n_workers > 1 the file
+    list is split into runs of frames_per_task consecutive files that are rendered by
+    worker processes, each with its own plotters, reader threads and the same
+    settings; results are yielded in the original order. At most 2 * n_workers tasks
+    are queued or finished but not yet consumed, so memory stays bounded when writing
+    is slower than rendering. With cache_dir, frames rendered by an earlier run with
+    the same settings are loaded instead.
+    Time spent per stage is added to timer (a StageTimer), if given.
+    """
+    timer = timer if timer is not None else StageTimer()
+    if n_workers <= 1:
+        renderers = [SliceRenderer(settings) for settings in settings_list]
+        yield from _render_files(renderers, vtk_files, cache_dir, timer, progress=True)
+        return
+
+    tasks = iter([vtk_files[i:i + frames_per_task] for i in range(0, len(vtk_files), frames_per_task)])
+    with Pool(n_workers, initializer=_init_worker, initargs=(settings_list, cache_dir)) as pool:
+        # Submit a new task only when one is consumed, as prefetch() does for threads
+        pending = deque(
+            pool.apply_async(_render_task, (task,)) for task in itertools.islice(tasks, 2 * n_workers)
+        )
+        done = 0
+        while pending:
+            frames, seconds = pending.popleft().get()
+            for task in itertools.islice(tasks, 1):
+                pending.append(pool.apply_async(_render_task, (task,)))
+            timer.merge(seconds)
+            done += len(frames)
+            print(f"[{done}/{len(vtk_files)}] Rendered")
+            yield from frames
+
+
+class GifStreamWriter:
+    """
+    Animated GIF writer that encodes and writes each frame as it is appended.
+
+    Every frame is quantized to its own 256-colour palette by Pillow, saved as a
+    single-frame GIF in memory and spliced into the output file with a local colour
+    table, so only one frame is held in memory at a time.
+    """
+
+    def __init__(self, path, fps, loop=0):
+        self.fp = open(path, "wb")
+        self.delay = max(1, int(round(100 / fps)))  # Frame delay in 1/100 s
+        self.loop = loop
+        self.count = 0
+
+    def append_data(self, img):
+        buffer = io.BytesIO()
+        Image.fromarray(np.asarray(img)[..., :3]).quantize(256).save(buffer, format="GIF")
+        gif = buffer.getvalue()
+
+        flags = gif[10]
+        table_end = 13 + (3 << ((flags & 0x07) + 1) if flags & 0x80 else 0)
+        palette = gif[13:table_end]
+
+        if self.count == 0:
+            # Header and logical screen descriptor without a global colour table
+            self.fp.write(b"GIF89a" + gif[6:10] + b"\x00\x00\x00")
+            self.fp.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + self.loop.to_bytes(2, "little") + b"\x00")
+
+        # Skip any extension blocks Pillow wrote before the image descriptor
+        pos = table_end
+        while gif[pos] == 0x21:
+            pos += 2
+            while gif[pos]:
+                pos += gif[pos] + 1
+            pos += 1
+        descriptor, data = gif[pos:pos + 10], gif[pos + 10:-1]
+
+        # Graphic control extension: restore to background, frame delay
+        self.fp.write(b"\x21\xf9\x04\x08" + self.delay.to_bytes(2, "little") + b"\x00\x00")
+        if descriptor[9] & 0x80:
+            self.fp.write(descriptor + data)  # Pillow already used a local colour table
+        else:
+            local_flags = (descriptor[9] & 0x40) | 0x80 | (flags & 0x07)
+            self.fp.write(descriptor[:9] + bytes([local_flags]) + palette + data)
+        self.count += 1
+
+    def close(self):
+        if not self.fp.closed:
+            self.fp.write(b"\x3b")
+            self.fp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PngSequenceWriter:
+    """Write frames as frame_00000.png, frame_00001.png, ... into a directory."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.count = 0
+
+    def append_data(self, img):
+        imageio.imwrite(os.path.join(self.directory, f"frame_{self.count:05d}.png"), img)
+        self.count += 1
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_frame_writer(output_file, fps):
+    """
+    Open an incremental animation writer; each append_data() call encodes one frame,
+    so memory use does not grow with the number of frames.
+    """
+    ext = os.path.splitext(output_file)[1].lower()
+    if ext == ".gif":
+        return GifStreamWriter(output_file, fps)
+    if ext == ".mp4":
+        return imageio.get_writer(output_file, fps=fps, codec="libx264", quality=8, macro_block_size=8)
+    if ext == ".webm":
+        return imageio.get_writer(output_file, fps=fps, codec="libvpx-vp9", quality=8, macro_block_size=8)
+    if not ext:
+        return PngSequenceWriter(output_file)
+    raise ValueError(f"Unsupported animation format: {output_file}")
+
+
+def main():
+    vtk_files = find_slices(base_path, time_min, time_max, time_stride)
+    print(f"Found {len(vtk_files)} VTK files.")
+
+    output_files = []
+    settings_list = []
+    ranges = {}  # Pre-pass results per field, shared by outputs of the same field
+    for output in outputs:
+        settings = dict(render_settings)
+        settings.update((key, value) for key, value in output.items() if key != "output_file")
+        field = settings["plot_field"]
+        if settings["scalar_range"] in ("minmax", "robust"):
+            if field not in ranges:
+                ranges[field] = global_scalar_range(vtk_files, field, n_workers)
+            if settings["scalar_range"] == "minmax":
+                settings["scalar_range"] = (ranges[field]["min"], ranges[field]["max"])
+            else:
+                settings["scalar_range"] = (ranges[field]["p1"], ranges[field]["p99"])
+            print(f"Locked scalar range for '{field}': {settings['scalar_range']}")
+        output_files.append(output["output_file"])
+        settings_list.append(settings)
+
+    n_frames = [0] * len(outputs)
+    timer = StageTimer()
+    with ExitStack() as stack:
+        writers = [stack.enter_context(open_frame_writer(path, fps)) for path in output_files]
+        for frames in iter_frames(vtk_files, settings_list, n_workers, frame_cache_dir, timer):
+            start = time.perf_counter()
+            for i, img in enumerate(frames):
+                if img is not None:
+                    writers[i].append_data(img)
+                    n_frames[i] += 1
+            timer.add("write", time.perf_counter() - start)
+    print(f"Stage times: {timer.report()}")
+
+    for path, count in zip(output_files, n_frames):
+        if count:
+            print(f"Animation saved as {path}")
+        else:
+            print(f" No frames collected for {path}. Check VTK contents.")
+
+
+if __name__ == "__main__":
+    main()
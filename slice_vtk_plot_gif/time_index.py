@@ -0,0 +1,103 @@
+import os
+import sys
+import json
+import re
+import hashlib
+
+# The shared cache location lives in waves/pack
+_pack_dir = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "waves", "pack"))
+if _pack_dir not in sys.path:
+    sys.path.insert(0, _pack_dir)
+from cache import cache_dir as _cache_root
+
+# Listings of time directories, kept per process and as JSON files under the shared
+# cache location (nothing is written into the listed directory); both are
+# invalidated when the directory mtime changes (a time directory was added or removed)
+index_dir = os.path.join(_cache_root, "time_index")
+_listings = {}
+
+_time_name = re.compile(r"[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?")
+
+
+def parse_time(name):
+    """Time value of an OpenFOAM time directory name, or None for other entries."""
+    # A plain decimal number only: float() would also accept 'nan', 'inf' or '1_0'
+    if not _time_name.fullmatch(name):
+        return None  # constant, system, 0.orig, ...
+    return float(name)
+
+
+def _scan(base_path):
+    entries = []
+    with os.scandir(base_path) as it:
+        for entry in it:
+            time = parse_time(entry.name)
+            if time is not None and entry.is_dir():
+                entries.append((time, entry.name))
+    entries.sort()
+    return entries
+
+
+def _index_file(base_path):
+    return os.path.join(index_dir, hashlib.sha1(base_path.encode()).hexdigest()[:16] + ".json")
+
+
+def list_time_dirs(base_path, use_cache=True):
+    """
+    Numeric subdirectories of base_path as (time, name) pairs sorted by time.
+
+    Non-numeric entries are skipped. With use_cache the listing is reused until the
+    mtime of base_path changes, so repeated calls cost a single stat.
+    """
+    base_path = os.path.abspath(base_path)
+    mtime_ns = os.stat(base_path).st_mtime_ns
+
+    if use_cache:
+        cached = _listings.get(base_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        try:
+            with open(_index_file(base_path)) as f:
+                index = json.load(f)
+            if index["path"] == base_path and index["mtime_ns"] == mtime_ns:
+                entries = [(time, name) for time, name in index["entries"]]
+                _listings[base_path] = (mtime_ns, entries)
+                return entries
+        except (OSError, ValueError, KeyError):
+            pass
+
+    entries = _scan(base_path)
+    if use_cache:
+        _listings[base_path] = (mtime_ns, entries)
+        index_file = _index_file(base_path)
+        try:
+            os.makedirs(index_dir, exist_ok=True)
+            tmp = f"{index_file}.tmp{os.getpid()}"
+            with open(tmp, "w") as f:
+                json.dump({"path": base_path, "mtime_ns": mtime_ns, "entries": entries}, f)
+            os.replace(tmp, index_file)
+        except OSError:
+            pass  # Read-only cache location
+    return entries
+
+
+def select_times(entries, time_min=None, time_max=None, stride=1):
+    """Entries with time_min <= time <= time_max, then every stride-th of them."""
+    selected = [
+        entry for entry in entries
+        if (time_min is None or entry[0] >= time_min) and (time_max is None or entry[0] <= time_max)
+    ]
+    return selected[::stride]
+
+
+def find_time_files(base_path, file_name, time_min=None, time_max=None, stride=1, use_cache=True):
+    """
+    Paths of <base_path>/<time>/<file_name> for the selected time directories, in time
+    order. Only the selected directories are checked for the file.
+    """
+    paths = []
+    for _, name in select_times(list_time_dirs(base_path, use_cache), time_min, time_max, stride):
+        path = os.path.join(base_path, name, file_name)
+        if os.path.exists(path):
+            paths.append(path)
+    return paths
@@ -0,0 +1,241 @@
+import os
+import argparse
+import numpy as np
+import pyvista as pv
+import vtk
+from multiprocessing import Pool
+from slice_store import is_slice_store, open_store
+from slice_vtk_plot_gif import find_slices, slice_time, topology_signature
+
+# Time steps of the store path sampled per block, which bounds the memory use
+store_block_size = 256
+
+
+class ProbeWeights:
+    """
+    Interpolation weights of a set of points on a slice, computed once per geometry.
+
+    Each point is mapped to the closest cell of the slice and to the interpolation
+    weights of that cell's points at the closest position on the cell. Sampling a frame
+    with the same geometry is then a gather and a weighted sum over all points at once.
+    """
+
+    def __init__(self, mesh, points, max_distance=None):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.max_distance = max_distance
+        self.signature = topology_signature(mesh)
+        self.mesh_points = np.array(mesh.points)
+
+        cell_ids, closest = mesh.find_closest_cell(self.points, return_closest_point=True)
+        self.cell_ids = np.atleast_1d(cell_ids)
+        closest = np.atleast_2d(closest)
+        self.distance = np.linalg.norm(closest - self.points, axis=1)
+        self.inside = np.ones(len(self.points), dtype=bool)
+        if max_distance is not None:
+            self.inside = self.distance <= max_distance
+
+        # Zero weights pad the rows of cells with fewer points
+        width = int(max(mesh.GetCell(int(cell_id)).GetNumberOfPoints() for cell_id in self.cell_ids))
+        self.point_ids = np.zeros((len(self.cell_ids), width), dtype=np.int64)
+        self.weights = np.zeros((len(self.cell_ids), width))
+        sub_id, dist2 = vtk.reference(0), vtk.reference(0.0)
+        for i, cell_id in enumerate(self.cell_ids):
+            # GetCell reuses one cell object, so each cell is used before the next is fetched
+            cell = mesh.GetCell(int(cell_id))
+            n = cell.GetNumberOfPoints()
+            weights = [0.0] * n
+            cell.EvaluatePosition(closest[i].tolist(), [0.0] * 3, sub_id, [0.0] * 3, dist2, weights)
+            self.point_ids[i, :n] = [cell.GetPointId(k) for k in range(n)]
+            self.weights[i, :n] = weights
+
+    def matches(self, mesh):
+        """True if mesh has the geometry these weights were computed for."""
+        return topology_signature(mesh) == self.signature and np.array_equal(mesh.points, self.mesh_points)
+
+    def sample(self, values, association):
+        """
+        Values at the probe points for a block of frames.
+
+        Parameters:
+            values (ndarray): Field of shape (n_times, n_values) or (n_times, n_values, n_components).
+            association (str): "point" (interpolated) or "cell" (value of the closest cell).
+
+        Returns:
+            ndarray: (n_times, n_probes[, n_components]); NaN for points farther than
+            max_distance from the slice.
+        """
+        if association == "point":
+            result = np.einsum("pk,tpk...->tp...", self.weights, values[:, self.point_ids])
+        else:
+            result = values[:, self.cell_ids].astype(float)
+        result[:, ~self.inside] = np.nan
+        return result
+
+
+def field_values(mesh, field):
+    """(values, association) of a field, preferring point data, which can be interpolated."""
+    if field in mesh.point_data:
+        return np.asarray(mesh.point_data[field]), "point"
+    if field in mesh.cell_data:
+        return np.asarray(mesh.cell_data[field]), "cell"
+    raise KeyError(f"Field '{field}' not found; available: {mesh.array_names}")
+
+
+def read_slice_field(source, field):
+    """Slice geometry with only the array of field, from a .vtp path or a (store, index) pair."""
+    if not isinstance(source, str):
+        store, index = source
+        return open_store(store).mesh(index, fields=[field])
+    reader = pv.get_reader(source)
+    reader.disable_all_point_arrays()
+    reader.disable_all_cell_arrays()
+    if field in reader.point_array_names:
+        reader.enable_point_array(field)
+    elif field in reader.cell_array_names:
+        reader.enable_cell_array(field)
+    return reader.read()
+
+
+# Per-process state of the sampling workers
+_worker = {}
+
+
+def _init_worker(weights, field):
+    _worker["weights"] = weights
+    _worker["field"] = field
+
+
+def _sample_task(source):
+    field = _worker["field"]
+    mesh = read_slice_field(source, field)
+    weights = _worker["weights"]
+    if not weights.matches(mesh):
+        # Geometry changed (remeshed or moving slice): locate the points again
+        weights = _worker["weights"] = ProbeWeights(mesh, weights.points, weights.max_distance)
+    values, association = field_values(mesh, field)
+    return slice_time(source), weights.sample(values[None], association)[0]
+
+
+def _sample_store(store_path, indices, points, field, max_distance):
+    store = open_store(store_path)
+    indices = np.asarray(indices, dtype=np.int64)
+    weights = ProbeWeights(store.mesh(int(indices[0]), fields=[field]), points, max_distance)
+    association = "point" if ("point", field) in store.arrays else "cell"
+    series = store.field(field, association)
+    blocks = [
+        weights.sample(np.asarray(series[indices[start:start + store_block_size]]), association)
+        for start in range(0, len(indices), store_block_size)
+    ]
+    return store.times[indices], np.concatenate(blocks), weights
+
+
+def sample_probes(sources, points, field="U", max_distance=None, processes=None):
+    """
+    Sample a field of a slice series at arbitrary points.
+
+    The containing cells and interpolation weights are computed on the first frame
+    and reused for every frame with the same geometry. For a slice store with fixed
+    points the selected frames are sampled directly from the memory-mapped arrays,
+    block by block; otherwise the files are read in a process pool.
+
+    Parameters:
+        sources (list): Time steps from find_slices (.vtp files or a slice store).
+        points (array): (n_probes, 3) probe locations.
+        field (str): Field to sample.
+        max_distance (float, optional): Points farther than this from the slice give NaN.
+        processes (int, optional): Worker processes; None uses all cores, 1 runs serially.
+
+    Returns:
+        times (ndarray): (n_times,)
+        values (ndarray): (n_times, n_probes) or (n_times, n_probes, n_components)
+        weights (ProbeWeights): Weights of the first frame, e.g. for the point distances.
+    """
+    first = sources[0]
+    if not isinstance(first, str) and not open_store(first[0]).moving_points:
+        return _sample_store(first[0], [index for _, index in sources], points, field, max_distance)
+
+    weights = ProbeWeights(read_slice_field(first, field), points, max_distance)
+    if processes == 1:
+        _init_worker(weights, field)
+        results = list(map(_sample_task, sources))
+    else:
+        with Pool(processes, initializer=_init_worker, initargs=(weights, field)) as pool:
+            results = pool.map(_sample_task, sources, chunksize=16)
+    times = np.array([time for time, _ in results])
+    values = np.stack([value for _, value in results])
+    return times, values, weights
+
+
+def _format_value(n_components):
+    if n_components == 1:
+        return "%.8g"
+    return "(" + " ".join(["%.8g"] * n_components) + ")"
+
+
+def write_probe_files(output_dir, times, values, points, field="U", combined=False):
+    """
+    Write sampled values in the OpenFOAM probe format of the data_U files.
+
+    By default each point goes to its own single-probe file <field>_probe<i>, which
+    file_processing.load_u_files reads like the probes written by the solver; with
+    combined=True all points go to one multi-probe file <field> (see read_probes).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    n_components = 1 if values.ndim == 2 else values.shape[2]
+    values = values.reshape(len(times), len(points), n_components)
+    value_format = _format_value(n_components)
+
+    if combined:
+        groups = [(os.path.join(output_dir, field), list(range(len(points))))]
+    else:
+        groups = [(os.path.join(output_dir, f"{field}_probe{i}"), [i]) for i in range(len(points))]
+
+    for path, probes in groups:
+        header = "".join(
+            f"# Probe {i} ({points[i][0]:g} {points[i][1]:g} {points[i][2]:g})\n" for i in probes
+        )
+        header += "# Time        " + "".join(f"{i:<14}" for i in probes) + "\n"
+        columns = np.column_stack([times, values[:, probes].reshape(len(times), -1)])
+        row_format = "%-13.8g " + "  ".join([value_format] * len(probes))
+        with open(path, "w") as f:
+            f.write(header)
+            # One format operation for the whole file instead of one per row
+            f.write(((row_format + "\n") * len(columns)) % tuple(columns.ravel().tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sample a slice series at virtual probe points.")
+    parser.add_argument("base_path", help="Directory of <time>/midPlaneXZ.vtp files or a slice store")
+    parser.add_argument("--points-file", help="Text file with one 'x y z' probe location per line")
+    parser.add_argument("--point", nargs=3, type=float, action="append", metavar=("X", "Y", "Z"),
+                        help="Probe location; repeat for several points")
+    parser.add_argument("--field", default="U", help="Field to sample (default: U)")
+    parser.add_argument("--max-distance", type=float, help="Points farther from the slice give NaN")
+    parser.add_argument("--combined", action="store_true", help="Write one multi-probe file")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--output-dir", default="data_U_virtual", help="Output directory")
+    parser.add_argument("--time-min", type=float, help="First time to use")
+    parser.add_argument("--time-max", type=float, help="Last time to use")
+    parser.add_argument("--stride", type=int, default=1, help="Use every n-th selected time step")
+    args = parser.parse_args()
+
+    points = []
+    if args.points_file:
+        points.extend(np.loadtxt(args.points_file, ndmin=2))
+    points.extend(args.point or [])
+    if not points:
+        parser.error("No probe points given; use --points-file or --point")
+    points = np.array(points, dtype=float)
+
+    sources = find_slices(args.base_path, args.time_min, args.time_max, args.stride)
+    kind = "slice store frames" if is_slice_store(args.base_path) else "VTK files"
+    print(f"Sampling {len(points)} points on {len(sources)} {kind}.")
+    times, values, weights = sample_probes(sources, points, args.field, args.max_distance, args.processes)
+    print(f"Largest distance of a point from the slice: {weights.distance.max():.3g}")
+
+    write_probe_files(args.output_dir, times, values, points, args.field, args.combined)
+    print(f"Probe data saved to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import numpy as np
+from resampling import resample
+
+# Runs correlated per batch of FFTs, which bounds the memory use
+block_size = 64
+
+
+def _correlate(a, b, n_fft):
+    # c[..., k] = sum_n a[..., n + k] * b[n] for every lag k (negative lags wrap around)
+    return np.fft.irfft(a * np.conj(b), n_fft)
+
+
+def _masked_ncc(runs, run_mask, reference, reference_mask, n_fft, min_overlap):
+    # Normalized cross-correlation over the overlapping samples only, for all lags:
+    # every sum over the overlap is a correlation with a mask, evaluated by FFT
+    spectra = {name: np.fft.rfft(values, n_fft) for name, values in (
+        ("x", runs), ("xx", runs * runs), ("mx", run_mask))}
+    reference_spectra = {name: np.fft.rfft(values, n_fft) for name, values in (
+        ("r", reference), ("rr", reference * reference), ("mr", reference_mask))}
+
+    count = np.rint(_correlate(spectra["mx"], reference_spectra["mr"], n_fft))
+    sum_x = _correlate(spectra["x"], reference_spectra["mr"], n_fft)
+    sum_r = _correlate(spectra["mx"], reference_spectra["r"], n_fft)
+    sum_xr = _correlate(spectra["x"], reference_spectra["r"], n_fft)
+    sum_xx = _correlate(spectra["xx"], reference_spectra["mr"], n_fft)
+    sum_rr = _correlate(spectra["mx"], reference_spectra["rr"], n_fft)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = sum_xr - sum_x * sum_r / count
+        variance = np.clip(sum_xx - sum_x**2 / count, 0, None) * np.clip(sum_rr - sum_r**2 / count, 0, None)
+        ncc = covariance / np.sqrt(variance)
+
+    # Lags with too little overlap give spurious peaks
+    shortest = np.minimum(run_mask.sum(axis=1), reference_mask.sum())[:, None]
+    ncc[(count < min_overlap * shortest) | ~np.isfinite(ncc)] = -np.inf
+    return ncc
+
+
+def _refine_peak(ncc, lags):
+    # Lag of the maximum, refined to a fraction of a sample by a parabola through the
+    # maximum and its two neighbours
+    rows = np.arange(len(ncc))
+    peak = ncc.argmax(axis=1)
+    n_fft = ncc.shape[1]
+    left = ncc[rows, (peak - 1) % n_fft]
+    centre = ncc[rows, peak]
+    right = ncc[rows, (peak + 1) % n_fft]
+    curvature = left - 2 * centre + right
+    with np.errstate(invalid="ignore", divide="ignore"):
+        offset = np.where(
+            np.isfinite(left) & np.isfinite(right) & (curvature < 0), (left - right) / (2 * curvature), 0.0
+        )
+    return lags[peak] + offset, centre
+
+
+def estimate_time_shift(times_list, values_list, reference_time, reference_values, scales=(1.0,),
+                        n_samples=8192, max_shift=None, min_overlap=0.5):
+    """
+    Time shift (and optionally time scale) that best lines a reference series up with
+    each of many runs, e.g. the experiment with the simulations.
+
+    The reference time is mapped to reference_time * scale + shift. For each scale the
+    runs and the scaled reference are resampled onto one uniform grid, and the
+    normalized cross-correlation over the overlapping part is computed for all lags at
+    once with FFTs, O(n log n) per run; runs are processed in batches. The best lag is
+    refined to a fraction of a grid step by parabolic interpolation.
+
+    Parameters:
+        times_list (list): Time array of each run.
+        values_list (list): Matching value arrays.
+        reference_time (array): Reference times, strictly increasing.
+        reference_values (array): Reference values.
+        scales (sequence): Candidate time scales of the reference; the best one is
+            chosen per run. The default (1.0,) estimates the shift only.
+        n_samples (int): Grid points over the time range of all series.
+        max_shift (float, optional): Largest shift considered, in either direction.
+        min_overlap (float): Smallest overlap considered, as a fraction of the shorter
+            of run and reference.
+
+    Returns:
+        shifts (ndarray), scales (ndarray), correlation (ndarray): Per run the shift,
+        the scale and the normalized cross-correlation reached (1 is a perfect match).
+    """
+    reference_time = np.asarray(reference_time, dtype=float)
+    n_runs = len(times_list)
+    best_shift = np.full(n_runs, np.nan)
+    best_scale = np.full(n_runs, np.nan)
+    best_ncc = np.full(n_runs, -np.inf)
+    run_first = min(np.min(t) for t in times_list)
+    run_last = max(np.max(t) for t in times_list)
+
+    for scale in scales:
+        scaled_time = reference_time * scale
+        grid = np.linspace(min(run_first, scaled_time[0]), max(run_last, scaled_time[-1]), n_samples)
+        dt = grid[1] - grid[0]
+        # Both sides at least as long as the grid, so no lag wraps onto another
+        n_fft = 2 * n_samples
+        lags = np.arange(n_fft)
+        lags[lags >= n_samples] -= n_fft
+        shifts = lags * dt
+
+        reference = resample([scaled_time], [reference_values], grid)[0]
+        reference_mask = ~np.isnan(reference)
+        # Removing the means first keeps the FFT sums free of cancellation; the
+        # correlation itself does not depend on them
+        reference = np.where(reference_mask, reference - np.nanmean(reference), 0.0)
+
+        for start in range(0, n_runs, block_size):
+            block = slice(start, min(start + block_size, n_runs))
+            # Bin averaging, as the runs are usually sampled much finer than the grid
+            runs = resample(times_list[block], values_list[block], grid, method="bin")
+            run_mask = ~np.isnan(runs)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                run_means = np.nansum(runs, axis=1, keepdims=True) / run_mask.sum(axis=1, keepdims=True)
+            runs = np.where(run_mask, runs - run_means, 0.0)
+
+            ncc = _masked_ncc(runs, run_mask.astype(float), reference, reference_mask.astype(float),
+                              n_fft, min_overlap)
+            if max_shift is not None:
+                ncc[:, np.abs(shifts) > max_shift] = -np.inf
+            lag, peak = _refine_peak(ncc, lags)
+
+            better = peak > best_ncc[block]
+            best_ncc[block] = np.where(better, peak, best_ncc[block])
+            best_shift[block] = np.where(better, lag * dt, best_shift[block])
+            best_scale[block] = np.where(better, scale, best_scale[block])
+
+    best_ncc[~np.isfinite(best_ncc)] = np.nan
+    return best_shift, best_scale, best_ncc
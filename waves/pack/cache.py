@@ -0,0 +1,123 @@
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+import pandas as pd
+
+# Sidecar cache location and size budget (least recently used entries are evicted)
+cache_dir = os.environ.get(
+    "POSTPROCESSING_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "python_postprocessing")
+)
+cache_max_bytes = 4 * 1024**3
+
+_meta_name = "meta.json"
+
+
+def cache_key(path, loader, options):
+    """Hash of the file identity (path, size, mtime) plus the loader and its options."""
+    stat = os.stat(path)
+    identity = {
+        "path": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "loader": f"{loader.__module__}.{loader.__qualname__}",
+        "options": {name: repr(value) for name, value in sorted(options.items())},
+    }
+    return hashlib.sha1(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+def file_digest(path, block_size=1 << 23):
+    """BLAKE2 hash of the file content."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_entry(entry, mmap_mode):
+    with open(os.path.join(entry, _meta_name)) as f:
+        meta = json.load(f)
+    columns = {
+        name: np.load(os.path.join(entry, f"col{i}.npy"), mmap_mode=mmap_mode)
+        for i, name in enumerate(meta["columns"])
+    }
+    os.utime(os.path.join(entry, _meta_name))  # Mark as recently used for eviction
+    return pd.DataFrame(columns, copy=False)
+
+
+def _write_entry(entry, data):
+    tmp = f"{entry}.tmp{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+    for i, name in enumerate(data.columns):
+        np.save(os.path.join(tmp, f"col{i}.npy"), np.ascontiguousarray(data[name].to_numpy()))
+    with open(os.path.join(tmp, _meta_name), "w") as f:
+        json.dump({"columns": [str(name) for name in data.columns]}, f)
+    try:
+        os.replace(tmp, entry)
+    except OSError:
+        # Another process stored the same entry first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _entry_size(entry):
+    return sum(e.stat().st_size for e in os.scandir(entry) if e.is_file())
+
+
+def evict(max_bytes=None, directory=None):
+    """Delete least recently used cache entries until the cache fits in max_bytes."""
+    max_bytes = cache_max_bytes if max_bytes is None else max_bytes
+    directory = directory or cache_dir
+    if not os.path.isdir(directory):
+        return
+
+    entries = []
+    for e in os.scandir(directory):
+        meta = os.path.join(e.path, _meta_name)
+        if e.is_dir() and os.path.exists(meta):
+            entries.append((os.path.getmtime(meta), _entry_size(e.path), e.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def cached_load(path, loader, mmap_mode="c", **options):
+    """
+    Load a file through a binary sidecar cache.
+
+    The first call runs loader(path, **options), which must return a DataFrame, and
+    stores each column as a .npy file. Later calls with the same file size, mtime and
+    options memory-map those columns instead of parsing the text file again.
+
+    The first call also returns the stored entry, so hits and misses give the same
+    result. With the default mmap_mode="c" the columns are writable copy-on-write
+    maps: changes stay private to the returned DataFrame and never reach the cache.
+    Only if the cache cannot be written is the loader's own DataFrame returned.
+
+    Parameters:
+        path (str): Data file to load.
+        loader (callable): Parser called as loader(path, **options) on a cache miss.
+        mmap_mode (str or None): Passed to np.load; "c" (copy-on-write), "r" (read-only)
+            or None, which reads the columns into memory.
+        **options: Parse options; they are part of the cache key.
+    """
+    entry = os.path.join(cache_dir, cache_key(path, loader, options))
+    if os.path.exists(os.path.join(entry, _meta_name)):
+        try:
+            return _read_entry(entry, mmap_mode)
+        except (OSError, ValueError):
+            shutil.rmtree(entry, ignore_errors=True)
+
+    data = loader(path, **options)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_entry(entry, data)
+        evict()
+        return _read_entry(entry, mmap_mode)
+    except (OSError, ValueError):
+        return data  # Read-only or full cache location: the parsed data is still valid
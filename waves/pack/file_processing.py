@@ -1,8 +1,222 @@
 import os
+import re
 import glob
+import warnings
+import numpy as np
 import pandas as pd
+from cache import cached_load
+from restarts import splice_restarts
 
-def load_u_files(data_U_folder, freestream_velocity, time_normalization):
+# Bytes read per block by the bulk probe parser (blocks are cut at line ends)
+chunk_size = 1 << 24
+
+_strip_parens = str.maketrans("()", "  ")
+
+
+def parse_block(text, n_rows, n_values):
+    """
+    Parse a block of whitespace separated numbers in one C-level pass.
+
+    Returns an (n_rows, n_values) array, or None if the block does not hold exactly
+    n_rows x n_values numbers (headers, blank or malformed lines).
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.fromstring(text, sep=" ")
+    except (ValueError, DeprecationWarning):
+        return None
+    if values.size != n_rows * n_values:
+        return None
+    return values.reshape(n_rows, n_values)
+
+
+def parse_lines(lines, n_values):
+    """Line-by-line fallback of parse_block: keep rows whose first n_values tokens are numbers."""
+    rows = []
+    for line in lines:
+        tokens = line.translate(_strip_parens).split()[:n_values]
+        if len(tokens) < n_values:
+            continue
+        try:
+            rows.append([float(token) for token in tokens])
+        except ValueError:
+            continue
+    return np.array(rows, dtype=float).reshape(-1, n_values)
+
+
+def _parse_probe_chunk(text, n_values):
+    n_rows = text.count("\n") + (not text.endswith("\n"))
+    rows = parse_block(text.translate(_strip_parens), n_rows, n_values)
+    if rows is not None:
+        return rows
+
+    # Headers or blank lines: drop them and retry the bulk path on the rest
+    lines = text.splitlines()
+    data_lines = [line for line in lines if line[:1] not in ("#", "") and not line.startswith("Time")]
+    rows = parse_block("\n".join(data_lines).translate(_strip_parens), len(data_lines), n_values)
+    if rows is not None:
+        return rows
+
+    # Malformed rows somewhere in this chunk: parse it line by line
+    return parse_lines(lines, n_values)
+
+
+def _iter_text_chunks(path, size):
+    with open(path, "rb") as f:
+        tail = b""
+        while True:
+            block = f.read(size)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            tail = block[cut:]
+            if cut:
+                yield block[:cut].decode("latin-1")
+        if tail:
+            yield tail.decode("latin-1")
+
+
+def read_probe_array(path, n_values=4):
+    """
+    Parse an OpenFOAM probe file into a (n_rows, n_values) float array.
+
+    Column 0 is the time and the remaining columns are the probe values in file
+    order; the default n_values=4 reads a single vector probe.
+    Header lines ('#', 'Time') and malformed rows are skipped. The file is read in
+    large chunks that are parsed in bulk; only chunks containing malformed rows fall
+    back to line-by-line parsing.
+    """
+    blocks = [_parse_probe_chunk(text, n_values) for text in _iter_text_chunks(path, chunk_size)]
+    if not blocks:
+        return np.empty((0, n_values))
+    return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+
+def read_u_file(u_file, freestream_velocity, time_normalization):
+    rows = read_probe_array(u_file)
+    return pd.DataFrame({
+        'Time': rows[:, 0] / time_normalization,  # Normalize time
+        'Velocity_X': rows[:, 1] / freestream_velocity,
+        'Velocity_Y': rows[:, 2] / freestream_velocity,
+        'Velocity_Z': rows[:, 3] / freestream_velocity,
+    })
+
+
+_probe_header = re.compile(r"#\s*Probe\s+(\d+)\s*\(([^)]*)\)")
+
+
+def _read_probe_layout(path):
+    # Probe locations from the '# Probe i (x y z)' header, plus the number of
+    # probes and components per probe taken from the first data row.
+    locations = {}
+    with open(path, "r", encoding="latin-1") as f:
+        for line in f:
+            match = _probe_header.match(line)
+            if match:
+                locations[int(match.group(1))] = [float(v) for v in match.group(2).split()]
+                continue
+            if not line.strip() or line.startswith(("#", "Time")):
+                continue
+            if "(" in line:
+                n_probes = line.count("(")
+                n_components = len(line.split("(", 2)[1].split(")")[0].split())
+            else:
+                n_probes = len(line.split()) - 1
+                n_components = 1
+            return locations, n_probes, n_components
+    return locations, len(locations), 1
+
+
+def read_probes(path):
+    """
+    Read an OpenFOAM probe file with any number of probes of a scalar or vector field.
+
+    Parameters:
+        path (str): Probe file, e.g. postProcessing/probes/0/U or .../p.
+
+    Returns:
+        times (ndarray): Sample times, shape (n_times,).
+        values (ndarray): Field values, shape (n_times, n_probes, n_components);
+            n_components is 1 for scalar fields such as p.
+        coords (DataFrame): Probe locations indexed by probe number with columns
+            x, y, z (NaN when the file has no '# Probe' header).
+    """
+    locations, n_probes, n_components = _read_probe_layout(path)
+    rows = read_probe_array(path, n_values=1 + n_probes * n_components)
+
+    if locations and len(locations) != n_probes:
+        raise ValueError(
+            f"{path}: header lists {len(locations)} probes but data rows hold {n_probes}"
+        )
+    coords = pd.DataFrame(
+        [locations.get(i, [np.nan] * 3) for i in range(n_probes)],
+        columns=["x", "y", "z"],
+        index=pd.RangeIndex(n_probes, name="Probe"),
+    )
+    return rows[:, 0], rows[:, 1:].reshape(-1, n_probes, n_components), coords
+
+
+def read_probes_restarts(paths):
+    """
+    read_probes for the probe files of a restarted run, merged into one series.
+
+    Files are ordered by their first time and in overlapping time ranges the later
+    restart wins. Returns (times, values, coords) like read_probes, with the probe
+    locations of the last file.
+    """
+    parts = [read_probes(path) for path in paths]
+    times, values = splice_restarts([part[0] for part in parts], [part[1] for part in parts])
+    return times, values, parts[-1][2]
+
+
+def _probe_location_lines(path):
+    # The '# Probe i (x y z)' lines at the top of a probe file
+    lines = []
+    with open(path, "r") as f:
+        for line in f:
+            if _probe_header.match(line):
+                lines.append(line.rstrip("\n") + "\n")
+            elif not line.startswith("#"):
+                break
+    return lines
+
+
+def write_shifted_probe_file(u_file, output_file, freestream_velocity, time_normalization,
+                             offsets=(0.0, 0.0, 0.0), time_offset=0.0):
+    """
+    Write a normalized, offset and time-shifted copy of a single vector probe file.
+
+    The input is processed in blocks of chunk_size bytes: each block is parsed in
+    bulk, transformed as whole arrays (time / time_normalization + time_offset,
+    velocity / freestream_velocity + offset) and formatted with one string operation,
+    so memory use is bounded by the block size. The output keeps the probe header of
+    the input and the OpenFOAM probe row layout.
+
+    Returns:
+        int: Number of data rows written.
+    """
+    header = _probe_location_lines(u_file) or ["# Probe 0 (-1 0 0)\n"]
+    divisor = np.array([time_normalization, freestream_velocity, freestream_velocity, freestream_velocity])
+    shift = np.array([time_offset, *offsets], dtype=float)
+    row_format = "%.7f     (%.4f %.6e %.6f)\n"
+
+    n_rows = 0
+    with open(output_file, "w") as out:
+        out.writelines(header)
+        out.write("# Time        0\n")
+        for text in _iter_text_chunks(u_file, chunk_size):
+            rows = _parse_probe_chunk(text, 4)
+            if not len(rows):
+                continue
+            rows = rows / divisor + shift
+            out.write((row_format * len(rows)) % tuple(rows.ravel().tolist()))
+            n_rows += len(rows)
+    return n_rows
+
+
+def load_u_files(data_U_folder, freestream_velocity, time_normalization, use_cache=True):
     u_files = glob.glob(os.path.join(data_U_folder, "U*"))
     if not u_files:
         raise FileNotFoundError(f"No U files found in {data_U_folder}")
@@ -12,28 +226,11 @@ def load_u_files(data_U_folder, freestream_velocity, time_normalization):
 
     for u_file in u_files:
         file_base = os.path.splitext(os.path.basename(u_file))[0]
-        time, velocity_x, velocity_y, velocity_z = [], [], [], []
-
-        with open(u_file, 'r') as f:
-            for line in f:
-                if line.strip() and not line.startswith("Time"):
-                    parts = line.split(maxsplit=1)
-                    try:
-                        time_val = float(parts[0]) / time_normalization  # Normalize time
-                        velocity_tuple = parts[1].strip("()\n").split()
-                        velocity_x.append(float(velocity_tuple[0]) / freestream_velocity)
-                        velocity_y.append(float(velocity_tuple[1]) / freestream_velocity)
-                        velocity_z.append(float(velocity_tuple[2]) / freestream_velocity)
-                        time.append(time_val)
-                    except (ValueError, IndexError):
-                        continue
-
-        data = pd.DataFrame({
-            'Time': time,
-            'Velocity_X': velocity_x,
-            'Velocity_Y': velocity_y,
-            'Velocity_Z': velocity_z,
-        })
+        if use_cache:
+            data = cached_load(u_file, read_u_file, freestream_velocity=freestream_velocity,
+                               time_normalization=time_normalization)
+        else:
+            data = read_u_file(u_file, freestream_velocity, time_normalization)
         data_list_u.append(data)
         labels_u.append(file_base)
 
@@ -0,0 +1,142 @@
+import numpy as np
+
+methods = ("linear", "cubic", "bin")
+
+
+def uniform_grid(times_list, n_samples=1000, dt=None, span="common"):
+    """
+    Uniform time grid for a set of series.
+
+    Parameters:
+        times_list (list): Time array of each series.
+        n_samples (int): Number of grid points; ignored if dt is given.
+        dt (float, optional): Grid spacing.
+        span (str): "common" covers the time range shared by all series, "union" the
+            range covered by any of them.
+
+    Returns:
+        ndarray: The grid.
+    """
+    firsts = [np.min(t) for t in times_list]
+    lasts = [np.max(t) for t in times_list]
+    if span == "common":
+        start, end = max(firsts), min(lasts)
+    elif span == "union":
+        start, end = min(firsts), max(lasts)
+    else:
+        raise ValueError(f"Unknown span '{span}'; use 'common' or 'union'")
+    if end < start:
+        raise ValueError("The series have no common time range")
+    if dt is not None:
+        n_samples = int(np.floor((end - start) / dt + 1e-9)) + 1
+        return start + dt * np.arange(n_samples)
+    return np.linspace(start, end, n_samples)
+
+
+def _flatten(times_list, values_list):
+    # All series back to back in two flat arrays, with the first index of each
+    if len(times_list) != len(values_list):
+        raise ValueError("times_list and values_list have different lengths")
+    times = [np.asarray(t, dtype=float).ravel() for t in times_list]
+    values = [np.asarray(v, dtype=float).ravel() for v in values_list]
+    for k, (t, v) in enumerate(zip(times, values)):
+        if len(t) != len(v):
+            raise ValueError(f"Series {k}: {len(t)} times but {len(v)} values")
+        if len(t) < 2:
+            raise ValueError(f"Series {k}: at least two samples are needed")
+        if np.any(np.diff(t) <= 0):
+            raise ValueError(f"Series {k}: times must be strictly increasing (merge restarts first)")
+    lengths = np.array([len(t) for t in times])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    return np.concatenate(times), np.concatenate(values), starts, lengths
+
+
+def _locate(t, starts, lengths, x):
+    # Index i of the segment [t[i], t[i+1]] of each series holding x[k, j]. Every series
+    # is mapped onto its own interval [k, k + 0.5] of one sorted key array, so a single
+    # searchsorted serves all series.
+    n_series = len(starts)
+    first = t[starts]
+    span = t[starts + lengths - 1] - first
+    key = np.repeat(np.arange(n_series), lengths) + 0.5 * (t - np.repeat(first, lengths)) / np.repeat(span, lengths)
+    x_key = np.arange(n_series)[:, None] + 0.5 * np.clip((x - first[:, None]) / span[:, None], 0, 1)
+    i = np.searchsorted(key, x_key, side="right") - 1
+    return np.clip(i, starts[:, None], (starts + lengths - 2)[:, None])
+
+
+def _slopes(t, y, starts, lengths):
+    # Derivative estimate at every sample, series by series
+    slopes = np.empty_like(y)
+    for start, length in zip(starts, lengths):
+        part = slice(start, start + length)
+        slopes[part] = np.gradient(y[part], t[part])
+    return slopes
+
+
+def resample(times_list, values_list, grid, method="linear", fill_value=np.nan):
+    """
+    Resample many series with their own time vectors onto one time grid.
+
+    All series are handled together: one search locates every grid point in every
+    series and the interpolation is evaluated on the whole (series x samples) array.
+
+    Methods:
+        linear: Piecewise linear interpolation (np.interp for every series).
+        cubic: Cubic Hermite interpolation with finite-difference slopes; smooth (C1)
+            and local, so one bad sample only affects its neighbours.
+        bin: Time-weighted average of the piecewise linear signal over the bin of each
+            grid point (edges halfway between grid points). Use it to downsample, where
+            picking single samples would alias the high frequencies.
+
+    Parameters:
+        times_list (list): Time array of each series, strictly increasing.
+        values_list (list): Matching value arrays.
+        grid (array): Increasing grid times, shared by all series.
+        method (str): "linear", "cubic" or "bin".
+        fill_value (float): Value for grid points outside the time range of a series.
+
+    Returns:
+        ndarray: C-contiguous float array of shape (n_series, n_samples).
+    """
+    if method not in methods:
+        raise ValueError(f"Unknown method '{method}'; use one of {methods}")
+    t, y, starts, lengths = _flatten(times_list, values_list)
+    grid = np.asarray(grid, dtype=float).ravel()
+    first = t[starts][:, None]
+    last = t[starts + lengths - 1][:, None]
+
+    if method == "bin":
+        if len(grid) < 2:
+            raise ValueError("Bin averaging needs at least two grid points")
+        half = np.diff(grid) / 2
+        edges = np.concatenate([[grid[0] - half[0]], grid[:-1] + half, [grid[-1] + half[-1]]])
+        edges = np.clip(edges[None, :], first, last)
+
+        # Integral of the linear interpolant from the start of each series to the edges
+        segments = (y[:-1] + y[1:]) / 2 * np.diff(t)
+        cumulative = np.concatenate([[0.0], np.cumsum(segments)])
+        i = _locate(t, starts, lengths, edges)
+        dx = edges - t[i]
+        slope = (y[i + 1] - y[i]) / (t[i + 1] - t[i])
+        integral = cumulative[i] - cumulative[starts][:, None] + dx * (y[i] + slope * dx / 2)
+
+        width = np.diff(edges, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = np.diff(integral, axis=1) / width
+        result[width <= 0] = fill_value  # Bin outside the series
+        return np.ascontiguousarray(result)
+
+    x = np.broadcast_to(grid, (len(starts), len(grid)))
+    i = _locate(t, starts, lengths, x)
+    t0, t1, y0, y1 = t[i], t[i + 1], y[i], y[i + 1]
+    h = t1 - t0
+    s = np.clip((x - t0) / h, 0, 1)
+    if method == "linear":
+        result = y0 + s * (y1 - y0)
+    else:
+        slopes = _slopes(t, y, starts, lengths)
+        s2, s3 = s * s, s * s * s
+        result = ((2 * s3 - 3 * s2 + 1) * y0 + (s3 - 2 * s2 + s) * h * slopes[i]
+                  + (3 * s2 - 2 * s3) * y1 + (s3 - s2) * h * slopes[i + 1])
+    result[(x < first) | (x > last)] = fill_value
+    return np.ascontiguousarray(result)
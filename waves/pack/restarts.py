@@ -0,0 +1,36 @@
+import numpy as np
+
+
+def splice_restarts(times_list, values_list):
+    """
+    Merge the output fragments of a restarted run into one monotonic series.
+
+    Fragments are ordered by their first time (ties keep the given order) and each
+    one is cut where the next one starts, so in overlapping ranges the later restart
+    wins. The cut points are found with searchsorted and the kept parts are copied
+    once into the result.
+
+    Parameters:
+        times_list (list): Time array of each fragment, increasing within a fragment.
+        values_list (list): Matching value arrays, with time along the first axis.
+
+    Returns:
+        times (ndarray), values (ndarray): The merged series.
+    """
+    fragments = [(t, v) for t, v in zip(times_list, values_list) if len(t)]
+    if not fragments:
+        raise ValueError("No data in any restart fragment")
+    order = sorted(range(len(fragments)), key=lambda k: fragments[k][0][0])
+    fragments = [fragments[k] for k in order]
+
+    kept = []
+    for k, (times, values) in enumerate(fragments):
+        # Rows from the start of the next restart onwards were overwritten by it
+        end = fragments[k + 1][0][0] if k + 1 < len(fragments) else np.inf
+        cut = np.searchsorted(times, end, side="left")
+        if cut:
+            kept.append((times[:cut], values[:cut]))
+
+    times = np.concatenate([np.asarray(t) for t, _ in kept])
+    values = np.concatenate([np.asarray(v) for _, v in kept])
+    return times, values
@@ -4,6 +4,13 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import logging
+import sys
+
+# Bulk probe parser and sidecar cache shared with the pack/ scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "pack"))
+from cache import cached_load
+from file_processing import read_u_file
+from resampling import resample, uniform_grid
 
 # Enable LaTeX rendering for text
 plt.rcParams.update({
@@ -33,18 +40,17 @@ data_csv_folder = "./data"
 freestream_velocity = 20  # Normalization factor for velocity
 time_normalization = 0.5  # Period for time normalization
 
+# Velocity component to plot: 'x', 'y' or 'z'
+component_to_plot = "z"
+
 # Load U* files
 u_files = glob.glob(os.path.join(data_U_folder, "U*"))
 if not u_files:
     print(f"No U files found in {data_U_folder}")
     exit()
 
-# User input for velocity component
-print("Specify which velocity component to plot (x, y, z):")
-component_to_plot = input("Enter 'x' for velocity_x, 'y' for velocity_y, or 'z' for velocity_z: ").strip().lower()
-
 if component_to_plot not in ['x', 'y', 'z']:
-    print("Invalid input. Please enter 'x', 'y', or 'z'.")
+    print(f"Invalid component_to_plot '{component_to_plot}'. Use 'x', 'y', or 'z'.")
     exit()
 
 # Component mapping
@@ -57,31 +63,8 @@ data_list_u = []
 labels_u = []
 for u_file in u_files:
     file_base = os.path.splitext(os.path.basename(u_file))[0]
-
-    # Parse U* files
-    time, velocity_x, velocity_y, velocity_z = [], [], [], []
-    with open(u_file, 'r') as f:
-        for line in f:
-            if line.strip() and not line.startswith("Time"):
-                parts = line.split(maxsplit=1)
-                try:
-                    time_val = float(parts[0]) / time_normalization  # Normalize time
-                    velocity_tuple = parts[1].strip("()\n").split()
-                    velocity_x.append(float(velocity_tuple[0]) / freestream_velocity)  # Normalize velocity
-                    velocity_y.append(float(velocity_tuple[1]) / freestream_velocity)
-                    velocity_z.append(float(velocity_tuple[2]) / freestream_velocity)
-                    time.append(time_val)
-                except (ValueError, IndexError) as e:
-                    logging.warning(f"Skipping line in {u_file} due to error: {e}")
-                    continue
-
-    data = pd.DataFrame({
-        'Time': time,
-        'Velocity_X': velocity_x,
-        'Velocity_Y': velocity_y,
-        'Velocity_Z': velocity_z,
-    })
-    data_list_u.append(data)
+    data_list_u.append(cached_load(u_file, read_u_file, freestream_velocity=freestream_velocity,
+                                   time_normalization=time_normalization))
     labels_u.append(file_base)
 
 # Load CSV files
@@ -210,14 +193,11 @@ if sinwave_exp_2_5c and sinwave_exp_0_5c:
     time_2_5c, amplitude_2_5c = sinwave_exp_2_5c
     time_0_5c, amplitude_0_5c = sinwave_exp_0_5c
     
-    # Find overlapping time range
-    common_start = max(time_2_5c.min(), time_0_5c.min())
-    common_end = min(time_2_5c.max(), time_0_5c.max())
-    common_time = np.linspace(common_start, common_end, num=1000)
-    
-    # Interpolate onto the common time grid
-    amplitude_2_5c_interp = np.interp(common_time, time_2_5c, amplitude_2_5c)
-    amplitude_0_5c_interp = np.interp(common_time, time_0_5c, amplitude_0_5c)
+    # Interpolate both onto a grid over their overlapping time range
+    common_time = uniform_grid([time_2_5c, time_0_5c], n_samples=1000)
+    amplitude_2_5c_interp, amplitude_0_5c_interp = resample(
+        [time_2_5c, time_0_5c], [amplitude_2_5c, amplitude_0_5c], common_time
+    )
     
     # Fill the area
     plt.fill_between(